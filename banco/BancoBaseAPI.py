@@ -5,10 +5,26 @@ from models.modelsBase import Cliente, init_db
 import sqlite3
 import requests
 from fastapi.responses import JSONResponse
+from admision import AdmisionMiddleware, ControlAdmision
+from compresion import CompresionMiddleware
 
 
 app = FastAPI()
 
+# Compresion negociada por Accept-Encoding (zstd/br si estan instalados, gzip siempre);
+# niveles y tamaño minimo en NIVELES_DEFECTO y MINIMO_DEFECTO de compresion.py
+app.add_middleware(CompresionMiddleware)
+
+# Control de admision: solicitudes concurrentes y cola de espera por clase de ruta.
+# Lo que excede la cola se rechaza con 503 y Retry-After en lugar de acumularse
+# en el threadpool.
+CONTROLES_ADMISION = {
+    "lectura": ControlAdmision(limite=32, cola=64, espera_max=1.0),
+    "escritura": ControlAdmision(limite=8, cola=16, espera_max=2.0),
+    "upstream": ControlAdmision(limite=4, cola=8, espera_max=2.0),
+}
+app.add_middleware(AdmisionMiddleware, controles=CONTROLES_ADMISION, retry_after=1)
+
 # Conexión y configuración de la base de datos
 DATABASE = "bancobase.db"
 init_db(DATABASE)
@@ -45,6 +61,10 @@ init_db(DATABASE)
 
 URL_TELCO = "http://localhost:8000/telco/"
 
+@app.get("/admision")
+def estado_admision():
+    return {clase: control.estado() for clase, control in CONTROLES_ADMISION.items()}
+
 @app.get("/deuda/{cedula}")
 def consulta_deuda(cedula: int):
     response = requests.get(URL_TELCO+"deuda/"+str(cedula)).text
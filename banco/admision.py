@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+
+class ControlAdmision:
+    """Limita las solicitudes concurrentes de una clase de rutas.
+
+    Hasta `limite` solicitudes se atienden a la vez y hasta `cola` esperan un
+    lugar como maximo `espera_max` segundos. El resto se rechaza de inmediato.
+    """
+
+    def __init__(self, limite: int, cola: int, espera_max: float = 1.0):
+        self.limite = limite
+        self.cola = cola
+        self.espera_max = espera_max
+        self.en_curso = 0
+        self.esperando = 0
+        self.rechazadas = 0
+        self._semaforo = None
+
+    def _get_semaforo(self) -> asyncio.Semaphore:
+        # se crea de forma perezosa para quedar ligado al loop del servidor
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.limite)
+        return self._semaforo
+
+    async def entrar(self) -> bool:
+        semaforo = self._get_semaforo()
+        if not semaforo.locked():
+            await semaforo.acquire()
+            self.en_curso += 1
+            return True
+        if self.esperando >= self.cola:
+            self.rechazadas += 1
+            return False
+        self.esperando += 1
+        try:
+            await asyncio.wait_for(semaforo.acquire(), timeout=self.espera_max)
+        except asyncio.TimeoutError:
+            self.rechazadas += 1
+            return False
+        finally:
+            self.esperando -= 1
+        self.en_curso += 1
+        return True
+
+    def salir(self):
+        self.en_curso -= 1
+        self._get_semaforo().release()
+
+    def estado(self) -> dict:
+        return {
+            "limite": self.limite,
+            "cola": self.cola,
+            "en_curso": self.en_curso,
+            "esperando": self.esperando,
+            "rechazadas": self.rechazadas,
+        }
+
+
+def clase_de_ruta(method: str, path: str) -> str:
+    if path.startswith("/deuda"):
+        return "upstream"
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return "lectura"
+    return "escritura"
+
+
+class AdmisionMiddleware:
+    """Middleware ASGI que aplica un ControlAdmision por clase de ruta.
+
+    Las solicitudes que no consiguen lugar reciben 503 con `Retry-After`
+    antes de ocupar un hilo del threadpool.
+    """
+
+    def __init__(self, app, controles: dict, retry_after: int = 1):
+        self.app = app
+        self.controles = controles
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        control = self.controles.get(clase_de_ruta(scope["method"], scope["path"]))
+        if control is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await control.entrar():
+            await self._rechazar(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            control.salir()
+
+    async def _rechazar(self, send):
+        body = json.dumps({"detail": "Servicio sobrecargado, reintente luego"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,203 @@
+import zlib
+from typing import Optional
+
+# zstd y brotli son opcionales: pip install zstandard brotli
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+NIVELES_DEFECTO = {"zstd": 3, "br": 4, "gzip": 6}
+# Respuestas menores (enviadas en un solo bloque) no se comprimen
+MINIMO_DEFECTO = 1024
+TIPOS_COMPRIMIBLES = ("application/json", "application/graphql-response+json", "text/")
+
+
+class _Gzip:
+    def __init__(self, nivel: int):
+        # wbits=31 produce formato gzip (cabecera + crc) en lugar de zlib crudo
+        self._c = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+
+    def comprimir(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def terminar(self) -> bytes:
+        return self._c.flush()
+
+
+class _Zstd:
+    def __init__(self, nivel: int):
+        self._c = zstandard.ZstdCompressor(level=nivel).compressobj()
+
+    def comprimir(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def terminar(self) -> bytes:
+        return self._c.flush()
+
+
+class _Brotli:
+    def __init__(self, nivel: int):
+        self._c = brotli.Compressor(quality=nivel)
+
+    def comprimir(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def terminar(self) -> bytes:
+        return self._c.finish()
+
+
+def codificaciones_disponibles() -> dict:
+    disponibles = {}
+    if zstandard is not None:
+        disponibles["zstd"] = _Zstd
+    if brotli is not None:
+        disponibles["br"] = _Brotli
+    disponibles["gzip"] = _Gzip
+    return disponibles
+
+
+def negociar(accept_encoding: str, disponibles: dict):
+    """Elige la codificacion aceptada por el cliente con mayor q.
+
+    A igual q se prefiere el orden de `disponibles` (zstd, br, gzip).
+    """
+    aceptadas = {}
+    for parte in accept_encoding.split(","):
+        partes = parte.strip().split(";")
+        nombre = partes[0].strip().lower()
+        if not nombre:
+            continue
+        q = 1.0
+        for param in partes[1:]:
+            clave, _, valor = param.strip().partition("=")
+            if clave == "q":
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        aceptadas[nombre] = q
+
+    mejor, mejor_q = None, 0.0
+    for nombre in disponibles:
+        q = aceptadas.get(nombre, aceptadas.get("*", 0.0))
+        if q > mejor_q:
+            mejor, mejor_q = nombre, q
+    return mejor
+
+
+class CompresionMiddleware:
+    """Middleware ASGI que comprime las respuestas segun `Accept-Encoding`.
+
+    Las respuestas menores a `minimo` bytes (enviadas en un solo bloque) se
+    dejan sin comprimir. Las respuestas en varios bloques se comprimen bloque a
+    bloque, sin acumular el cuerpo completo en memoria.
+
+    Toda respuesta de un tipo comprimible lleva `Vary: Accept-Encoding`, se
+    comprima o no: con otro Accept-Encoding la misma URL podria venir comprimida
+    y un cache intermedio no debe mezclar ambas.
+    """
+
+    def __init__(self, app, minimo: int = MINIMO_DEFECTO, niveles: dict = None):
+        self.app = app
+        self.minimo = minimo
+        self.niveles = {**NIVELES_DEFECTO, **(niveles or {})}
+        self.disponibles = codificaciones_disponibles()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for clave, valor in scope["headers"]:
+            if clave == b"accept-encoding":
+                accept = valor.decode("latin-1")
+                break
+        codificacion = negociar(accept, self.disponibles)
+        respuesta = _RespuestaComprimida(send, codificacion, self)
+        await self.app(scope, receive, respuesta.send)
+
+
+def _con_vary(headers) -> list:
+    """Agrega accept-encoding al header Vary, respetando el que ya traiga la respuesta."""
+    resultado, vary = [], None
+    for clave, valor in headers:
+        if clave == b"vary":
+            vary = valor
+        else:
+            resultado.append((clave, valor))
+    valores = [v.strip() for v in (vary or b"").split(b",") if v.strip()]
+    if not {b"accept-encoding", b"*"} & {v.lower() for v in valores}:
+        valores.append(b"accept-encoding")
+    resultado.append((b"vary", b", ".join(valores)))
+    return resultado
+
+
+class _RespuestaComprimida:
+
+    def __init__(self, send, codificacion: Optional[str], config: CompresionMiddleware):
+        self._send = send
+        self.codificacion = codificacion
+        self.config = config
+        self.inicio = None
+        self.compresor = None
+        self.directo = False
+
+    def _comprimible(self) -> bool:
+        tipo = ""
+        for clave, valor in self.inicio["headers"]:
+            if clave == b"content-encoding":
+                return False
+            if clave == b"content-type":
+                tipo = valor.decode("latin-1")
+        return tipo.startswith(TIPOS_COMPRIMIBLES)
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            # se retiene hasta ver el primer bloque del cuerpo
+            self.inicio = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        mas = message.get("more_body", False)
+
+        if self.inicio is not None:
+            chico = not mas and len(body) < self.config.minimo
+            if not self._comprimible():
+                self.directo = True
+                await self._send(self.inicio)
+            elif chico or self.codificacion is None:
+                self.directo = True
+                await self._send({**self.inicio, "headers": _con_vary(self.inicio["headers"])})
+            else:
+                await self._empezar(self.inicio)
+            self.inicio = None
+
+        if self.directo:
+            await self._send(message)
+            return
+
+        data = self.compresor.comprimir(body)
+        if not mas:
+            data += self.compresor.terminar()
+        await self._send({"type": "http.response.body", "body": data, "more_body": mas})
+
+    async def _empezar(self, inicio):
+        nivel = self.config.niveles[self.codificacion]
+        self.compresor = self.config.disponibles[self.codificacion](nivel)
+        headers = [
+            (clave, valor) for clave, valor in inicio["headers"]
+            if clave != b"content-length"
+        ]
+        headers.append((b"content-encoding", self.codificacion.encode()))
+        await self._send({**inicio, "headers": _con_vary(headers)})
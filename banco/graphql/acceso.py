@@ -0,0 +1,102 @@
+# acceso.py
+import asyncio
+from starlette.concurrency import run_in_threadpool
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession
+except ImportError:
+    # sin greenlet/sqlalchemy[asyncio] solo existe el modo sync; isinstance(x, ()) es False
+    AsyncSession = ()
+
+# Los resolvers son async y funcionan con Session o con AsyncSession (BANCO_ASYNC_DB).
+#
+# Las lecturas no usan la sesion: toman una conexion del pool solo mientras dura
+# el SELECT, asi un request que espera a un DataLoader no retiene una conexion.
+# Con Session todo corre en el threadpool: si la espera por una conexion libre
+# ocurriera en el event loop, bloquearia a los requests que tienen que devolverla.
+#
+# Las escrituras si usan la sesion del request. Una sesion no admite operaciones
+# concurrentes, y graphql-core resuelve campos hermanos (y un lote de operaciones)
+# en paralelo, asi que cada escritura completa (add/execute, commit y refresh)
+# corre bajo un lock de la sesion. Si falla se hace rollback antes de soltar el
+# lock: la sesion queda usable y el error no pasa a la siguiente escritura.
+
+
+def _leer_sync(engine, stmt) -> list:
+    with engine.connect() as conexion:
+        return conexion.execute(stmt).all()
+
+
+async def leer(session, stmt) -> list:
+    """Ejecuta un SELECT en una conexion corta y devuelve todas las filas."""
+    if isinstance(session, AsyncSession):
+        async with session.bind.connect() as conexion:
+            return (await conexion.execute(stmt)).all()
+    return await run_in_threadpool(_leer_sync, session.get_bind(), stmt)
+
+
+def _lock(session) -> asyncio.Lock:
+    return session.info.setdefault("lock", asyncio.Lock())
+
+
+def _guardar_sync(session, objeto):
+    try:
+        session.add(objeto)
+        session.commit()
+        session.refresh(objeto)
+        session.expunge(objeto)
+    except Exception:
+        session.rollback()
+        raise
+
+
+async def _guardar_async(session, objeto):
+    try:
+        session.add(objeto)
+        await session.commit()
+        await session.refresh(objeto)
+        session.expunge(objeto)
+    except Exception:
+        await session.rollback()
+        raise
+
+
+async def guardar(session, objeto):
+    """Inserta `objeto`, confirma y lo recarga (ids y defaults de la base).
+
+    Se devuelve separado de la sesion: el commit de otra operacion del lote
+    no expira sus atributos mientras se serializa la respuesta.
+    """
+    async with _lock(session):
+        if isinstance(session, AsyncSession):
+            await _guardar_async(session, objeto)
+        else:
+            await run_in_threadpool(_guardar_sync, session, objeto)
+
+
+def _escribir_sync(session, stmt, params) -> list:
+    try:
+        filas = session.execute(stmt, params).all()
+        session.commit()
+        return filas
+    except Exception:
+        session.rollback()
+        raise
+
+
+async def _escribir_async(session, stmt, params) -> list:
+    try:
+        filas = (await session.execute(stmt, params)).all()
+        await session.commit()
+        return filas
+    except Exception:
+        await session.rollback()
+        raise
+
+
+async def escribir(session, stmt, params=None) -> list:
+    """Ejecuta una sentencia con RETURNING en su propia transaccion y devuelve las filas."""
+    async with _lock(session):
+        if isinstance(session, AsyncSession):
+            return await _escribir_async(session, stmt, params)
+        return await run_in_threadpool(_escribir_sync, session, stmt, params)
@@ -0,0 +1,129 @@
+import asyncio
+import random
+import statistics
+import sys
+import time
+import httpx
+
+### Compara el throughput del modo sync y async de los resolvers con mucha concurrencia
+# pip install httpx aiosqlite greenlet
+
+# Levantar el servidor en cada modo (dos terminales, dentro de banco/graphql):
+# uvicorn graphql_main:app --port 8000
+# BANCO_ASYNC_DB=1 uvicorn graphql_main:app --port 8001
+
+# Antes, con los servidores apagados, cargar datos sinteticos (clientes con cuentas y pagos):
+# python benchmark.py sembrar [clientes]
+
+# Ejecutar el benchmark:
+# python benchmark.py [solicitudes] [concurrencia]
+
+CONSULTA = """
+query ($first: Int, $after: String) {
+  allClientes(first: $first, after: $after) {
+    edges { node { id nombre cuentas { id pagos { monto moneda } } } }
+  }
+}
+"""
+
+CLIENTES_SEMILLA = 5000
+CUENTAS_POR_CLIENTE = 2
+PAGOS_POR_CUENTA = 3
+
+
+def sembrar(clientes: int):
+    """Inserta `clientes` clientes, cada uno con sus cuentas y pagos, directo en la base."""
+    from sqlalchemy import func, insert, select
+    from models import Cliente, Cuenta, Pagos, engine, init_db
+
+    init_db()
+    with engine.begin() as conexion:
+        desde = conexion.execute(select(func.coalesce(func.max(Cliente.id), 0))).scalar()
+        conexion.execute(insert(Cliente), [
+            {"cedula": f"bench-{desde + i}", "nombre": f"Cliente {desde + i}", "apellido": "Bench"}
+            for i in range(1, clientes + 1)
+        ])
+        ids = conexion.execute(select(Cliente.id).where(Cliente.id > desde)).scalars().all()
+        conexion.execute(insert(Cuenta), [
+            {"cliente_id": cliente_id, "cuenta": cliente_id * 10 + n}
+            for cliente_id in ids for n in range(CUENTAS_POR_CLIENTE)
+        ])
+        cuentas = conexion.execute(select(Cuenta.id).where(Cuenta.cliente_id > desde)).scalars().all()
+        conexion.execute(insert(Pagos), [
+            {"cuenta_id": cuenta_id, "monto": 1000 * (n + 1), "moneda": "GS", "numero_factura": f"B-{cuenta_id}-{n}"}
+            for cuenta_id in cuentas for n in range(PAGOS_POR_CUENTA)
+        ])
+    print(f"{len(ids)} clientes, {len(cuentas)} cuentas, {len(cuentas) * PAGOS_POR_CUENTA} pagos")
+
+
+async def cursores(client: httpx.AsyncClient, url: str) -> list:
+    """Cursores reales de allClientes: cada pagina del benchmark empieza en un cliente existente."""
+    resultado, after = [None], None
+    while True:
+        respuesta = await client.post(url, json={
+            "query": "query ($after: String) { allClientes(first: 200, after: $after) "
+                     "{ edges { cursor } pageInfo { hasNextPage endCursor } } }",
+            "variables": {"after": after},
+        })
+        pagina = respuesta.json()["data"]["allClientes"]
+        resultado += [edge["cursor"] for edge in pagina["edges"]]
+        if not pagina["pageInfo"]["hasNextPage"]:
+            return resultado[:-1]
+        after = pagina["pageInfo"]["endCursor"]
+
+
+async def medir(url: str, num_requests: int, concurrencia: int) -> dict:
+    """Envia `num_requests` consultas con a lo sumo `concurrencia` en vuelo."""
+    semaforo = asyncio.Semaphore(concurrencia)
+    latencias = []
+    errores = 0
+
+    async def una(client: httpx.AsyncClient, inicios: list):
+        nonlocal errores
+        # cursor real y tamaño de pagina al azar: cada pagina trae clientes con
+        # sus cuentas y pagos, y con suficientes clientes casi ninguna combinacion
+        # se repite, asi el cache de respuestas no sirve las consultas
+        variables = {"first": random.randint(1, 20), "after": random.choice(inicios)}
+        async with semaforo:
+            inicio = time.perf_counter()
+            respuesta = await client.post(url, json={"query": CONSULTA, "variables": variables})
+            latencias.append(time.perf_counter() - inicio)
+            if respuesta.status_code != 200 or "errors" in respuesta.json():
+                errores += 1
+
+    limites = httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia)
+    async with httpx.AsyncClient(timeout=30.0, limits=limites) as client:
+        inicios = await cursores(client, url)
+        url_cache = url.replace("/graphql", "/metrics/cache")
+        antes = (await client.get(url_cache)).json()
+        inicio = time.perf_counter()
+        await asyncio.gather(*[una(client, inicios) for _ in range(num_requests)])
+        duracion = time.perf_counter() - inicio
+        despues = (await client.get(url_cache)).json()
+
+    latencias.sort()
+    return {
+        "req/s": num_requests / duracion,
+        "p50 ms": statistics.median(latencias) * 1000,
+        "p99 ms": latencias[int(len(latencias) * 0.99) - 1] * 1000,
+        "errores": errores,
+        # si es alto se midio el cache y no los resolvers: sembrar mas clientes
+        "cache aciertos %": 100 * (despues["aciertos"] - antes["aciertos"]) / num_requests,
+    }
+
+
+async def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "sembrar":
+        sembrar(int(sys.argv[2]) if len(sys.argv) > 2 else CLIENTES_SEMILLA)
+        return
+    num_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrencia = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    for nombre, url in [("sync", "http://localhost:8000/graphql"), ("async", "http://localhost:8001/graphql")]:
+        print(f"\n--- Resolvers {nombre}: {num_requests} solicitudes, concurrencia {concurrencia} ---")
+        resultado = await medir(url, num_requests, concurrencia)
+        print(", ".join(f"{clave}: {valor:.1f}" for clave, valor in resultado.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,183 @@
+# cache_respuestas.py
+import hashlib
+import json
+from collections import OrderedDict
+from functools import lru_cache
+from graphql import (
+    ExecutionResult,
+    FieldNode,
+    InlineFragmentNode,
+    OperationType,
+    get_named_type,
+    parse,
+    print_ast,
+)
+from graphql.utilities import get_operation_ast
+from strawberry.extensions import SchemaExtension
+
+# Memoria maxima de respuestas guardadas (tamaño del JSON) y de una sola respuesta
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+RESPUESTA_MAX_BYTES = 1024 * 1024
+
+# Tabla de la que lee cada tipo GraphQL; las respuestas se etiquetan con estas tablas
+TABLAS_POR_TIPO = {
+    "Cliente": "clientes",
+    "Cuenta": "cuentas",
+    "Pago": "pagos",
+    "PagosPorCuenta": "pagos",
+    "TotalMoneda": "pagos",
+}
+
+# Tabla que lee cada campo, para los que devuelven un tipo sin tabla (Connection):
+# `{ allClientes { totalCount } }` no selecciona ningun Cliente pero lee clientes
+TABLAS_POR_CAMPO = {
+    ("Query", "allClientes"): "clientes",
+    ("Query", "allCuentas"): "cuentas",
+    ("Query", "allPagos"): "pagos",
+    ("Query", "pagosPorCuenta"): "pagos",
+    ("Cliente", "cuentas"): "cuentas",
+    ("Cuenta", "pagos"): "pagos",
+    ("PagosPorCuenta", "pagos"): "pagos",
+    ("PagosPorCuenta", "totales"): "pagos",
+}
+
+
+class CacheRespuestas:
+    """LRU de respuestas de consultas con invalidacion por etiquetas (tablas)."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entradas = OrderedDict()
+        self._por_etiqueta = {}
+        self._versiones = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidadas = 0
+
+    def obtener(self, clave: str):
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return entrada[0]
+
+    def versiones(self) -> dict:
+        return dict(self._versiones)
+
+    def guardar(self, clave: str, data, etiquetas: frozenset, versiones: dict):
+        # si una mutacion invalido alguna etiqueta mientras se ejecutaba la
+        # consulta, la respuesta puede estar desactualizada y no se guarda
+        if any(self._versiones.get(e, 0) != versiones.get(e, 0) for e in etiquetas):
+            return
+        tamanio = len(json.dumps(data, separators=(",", ":")))
+        if tamanio > RESPUESTA_MAX_BYTES:
+            return
+        self._quitar(clave)
+        self._entradas[clave] = (data, etiquetas, tamanio)
+        self.bytes += tamanio
+        for etiqueta in etiquetas:
+            self._por_etiqueta.setdefault(etiqueta, set()).add(clave)
+        while self.bytes > self.max_bytes:
+            self._quitar(next(iter(self._entradas)))
+
+    def _quitar(self, clave: str):
+        entrada = self._entradas.pop(clave, None)
+        if entrada is None:
+            return
+        _, etiquetas, tamanio = entrada
+        self.bytes -= tamanio
+        for etiqueta in etiquetas:
+            self._por_etiqueta[etiqueta].discard(clave)
+
+    def invalidar(self, *etiquetas: str):
+        for etiqueta in etiquetas:
+            self._versiones[etiqueta] = self._versiones.get(etiqueta, 0) + 1
+            for clave in list(self._por_etiqueta.get(etiqueta, ())):
+                self._quitar(clave)
+                self.invalidadas += 1
+
+    def estado(self) -> dict:
+        consultas = self.aciertos + self.fallos
+        return {
+            "entradas": len(self._entradas),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "ratio_aciertos": self.aciertos / consultas if consultas else 0.0,
+            "invalidadas": self.invalidadas,
+        }
+
+
+respuestas = CacheRespuestas(CACHE_MAX_BYTES)
+
+
+@lru_cache(maxsize=256)
+def hash_normalizado(query: str) -> str:
+    # print_ast descarta espacios, comentarios y formato del texto original
+    return hashlib.sha256(print_ast(parse(query)).encode("utf-8")).hexdigest()
+
+
+def _tablas(schema, seleccion, tipo, fragmentos) -> set:
+    tablas = set()
+    for nodo in seleccion.selections:
+        if isinstance(nodo, FieldNode):
+            if (tipo.name, nodo.name.value) in TABLAS_POR_CAMPO:
+                tablas.add(TABLAS_POR_CAMPO[(tipo.name, nodo.name.value)])
+            if nodo.name.value.startswith("__") or not nodo.selection_set:
+                continue
+            subtipo = get_named_type(tipo.fields[nodo.name.value].type)
+        elif isinstance(nodo, InlineFragmentNode):
+            subtipo = schema.get_type(nodo.type_condition.name.value) if nodo.type_condition else tipo
+        else:
+            nodo = fragmentos[nodo.name.value]
+            subtipo = schema.get_type(nodo.type_condition.name.value)
+        if subtipo.name in TABLAS_POR_TIPO:
+            tablas.add(TABLAS_POR_TIPO[subtipo.name])
+        tablas |= _tablas(schema, nodo.selection_set, subtipo, fragmentos)
+    return tablas
+
+
+def tablas_leidas(schema, documento, operacion) -> frozenset:
+    fragmentos = {d.name.value: d for d in documento.definitions if d.kind == "fragment_definition"}
+    raiz = schema.get_root_type(operacion.operation)
+    return frozenset(_tablas(schema, operacion.selection_set, raiz, fragmentos))
+
+
+class CacheConsultas(SchemaExtension):
+    """Sirve consultas repetidas desde `respuestas` sin ejecutar resolvers.
+
+    La clave es el hash del documento normalizado mas operacion y variables.
+    Las mutaciones invalidan por tabla con `respuestas.invalidar(...)`.
+    """
+
+    def on_execute(self):
+        contexto = self.execution_context
+        operacion = get_operation_ast(contexto.graphql_document, contexto.operation_name)
+        if operacion is None or operacion.operation != OperationType.QUERY or not contexto.query:
+            yield
+            return
+
+        clave = "|".join([
+            hash_normalizado(contexto.query),
+            contexto.operation_name or "",
+            json.dumps(contexto.variables or {}, sort_keys=True),
+        ])
+        data = respuestas.obtener(clave)
+        if data is not None:
+            contexto.result = ExecutionResult(data=data)
+            yield
+            return
+
+        versiones = respuestas.versiones()
+        yield
+
+        resultado = contexto.result
+        if isinstance(resultado, ExecutionResult) and not resultado.errors and resultado.data is not None:
+            etiquetas = tablas_leidas(contexto.schema._schema, contexto.graphql_document, operacion)
+            # sin etiquetas ninguna mutacion la invalidaria: no se guarda
+            if etiquetas:
+                respuestas.guardar(clave, resultado.data, etiquetas, versiones)
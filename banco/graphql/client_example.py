@@ -1,27 +1,28 @@
-import requests
+from cliente import ClienteGraphQL
+
+# un solo cliente para todas las llamadas: reutiliza la conexion y el schema cacheado
+cliente = ClienteGraphQL()
 
 def get_clients():
-    url = "http://localhost:8000/graphql"
     comando = """
     query {
       allClientes {
-        id
-        cedula
-        nombre
-        apellido
+        edges {
+          node {
+            id
+            cedula
+            nombre
+            apellido
+          }
+        }
       }
     }
     """
     
-    response = requests.post(url, json={'query': comando})
-    if response.status_code == 200:
-        result = response.json()
-        clientes = result['data']['allClientes']
-        return clientes
-    else:
-        raise Exception(f"Query failed to run by returning code of {response.status_code}. {response.text}")
+    result = cliente.ejecutar(comando)
+    return [edge['node'] for edge in result['allClientes']['edges']]
 
 if __name__ == "__main__":
     clients = get_clients()
-    for cliente in clients:
-        print(f"ID: {cliente['id']}, Cedula: {cliente['cedula']}, Nombre: {cliente['nombre']}, Apellido: {cliente['apellido']}")
+    for c in clients:
+        print(f"ID: {c['id']}, Cedula: {c['cedula']}, Nombre: {c['nombre']}, Apellido: {c['apellido']}")
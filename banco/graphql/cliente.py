@@ -0,0 +1,310 @@
+# cliente.py
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from functools import lru_cache
+import httpx
+import requests
+from graphql import build_client_schema, get_introspection_query, parse, validate
+
+### Cliente reutilizable para la API GraphQL de banco
+# pip install requests httpx
+#
+# Crear un cliente una vez y reutilizarlo: mantiene las conexiones abiertas
+# (keep-alive) y no vuelve a pedir el schema en cada llamada.
+#
+#   cliente = ClienteGraphQL()
+#   data = cliente.ejecutar("query ($name: String) { ... }", {"name": "Luis"})
+#
+#   async with ClienteGraphQLAsync(agrupar=True) as cliente:
+#       a, b = await asyncio.gather(cliente.ejecutar(q1), cliente.ejecutar(q2))   # un solo POST
+
+URL = "http://localhost:8000/graphql"
+
+# El schema obtenido por introspeccion se guarda en disco y se reutiliza por SCHEMA_TTL segundos
+SCHEMA_TTL = 3600
+SCHEMA_DIRECTORIO = tempfile.gettempdir()
+
+# Igual a LOTE_MAX_OPERACIONES del servidor
+LOTE_MAX = 10
+# Tiempo que el cliente async espera a otras consultas antes de enviar un lote
+LOTE_ESPERA = 0.005
+
+
+class ErrorGraphQL(Exception):
+    """La operacion devolvio `errors`. Se conserva la lista completa en `errores`."""
+
+    def __init__(self, errores: list):
+        self.errores = errores
+        super().__init__("; ".join(e.get("message", "") for e in errores))
+
+
+@lru_cache(maxsize=256)
+def _documento(query: str):
+    return parse(query)
+
+
+@lru_cache(maxsize=256)
+def _hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def ruta_schema(url: str) -> str:
+    nombre = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SCHEMA_DIRECTORIO, f"banco_schema_{nombre}.json")
+
+
+def leer_schema_cache(url: str, ttl: int = SCHEMA_TTL):
+    """Introspeccion guardada para `url`, o None si no existe o vencio."""
+    ruta = ruta_schema(url)
+    try:
+        if time.time() - os.path.getmtime(ruta) > ttl:
+            return None
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def guardar_schema_cache(url: str, introspeccion: dict):
+    ruta = ruta_schema(url)
+    # se escribe en un temporal y se renombra para que otro proceso no lea un archivo a medias
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(introspeccion, f)
+    os.replace(temporal, ruta)
+
+
+def schema_cacheado(url: str = URL, ttl: int = SCHEMA_TTL, session: requests.Session = None):
+    """GraphQLSchema del servidor, desde disco o por introspeccion si vencio el cache."""
+    introspeccion = leer_schema_cache(url, ttl)
+    if introspeccion is None:
+        respuesta = (session or requests).post(url, json={"query": get_introspection_query()})
+        respuesta.raise_for_status()
+        introspeccion = respuesta.json()["data"]
+        guardar_schema_cache(url, introspeccion)
+    return build_client_schema(introspeccion)
+
+
+def _cuerpo(query: str, variables: dict, persistida: bool, con_texto: bool) -> dict:
+    cuerpo = {"variables": variables or {}}
+    if persistida:
+        cuerpo["extensions"] = {"persistedQuery": {"version": 1, "sha256Hash": _hash(query)}}
+    if con_texto or not persistida:
+        cuerpo["query"] = query
+    return cuerpo
+
+
+def _no_encontrada(resultado: dict) -> bool:
+    return any(
+        (e.get("extensions") or {}).get("code") == "PERSISTED_QUERY_NOT_FOUND"
+        for e in resultado.get("errors") or ()
+    )
+
+
+def _datos(resultado: dict):
+    if resultado.get("errors"):
+        return ErrorGraphQL(resultado["errors"])
+    return resultado["data"]
+
+
+class _Base:
+
+    def __init__(self, url: str, schema_ttl: int, validar: bool, persistidas: bool):
+        self.url = url
+        self.schema_ttl = schema_ttl
+        self.validar = validar
+        self.persistidas = persistidas
+        self._schema = None
+
+    def _errores_locales(self, query: str):
+        """Valida contra el schema cacheado sin ir al servidor."""
+        if not self.validar or self._schema is None:
+            return None
+        errores = validate(self._schema, _documento(query))
+        if errores:
+            return ErrorGraphQL([e.formatted for e in errores])
+        return None
+
+    def _lote(self, operaciones: list, con_texto: bool) -> list:
+        return [_cuerpo(q, v, self.persistidas, con_texto) for q, v in operaciones]
+
+
+class ClienteGraphQL(_Base):
+    """Cliente sync sobre una requests.Session compartida (keep-alive).
+
+    Con `persistidas` envia primero solo el hash de la consulta (APQ) y repite
+    con el texto si el servidor no la conoce. Con `validar` las consultas se
+    validan localmente contra el schema cacheado en disco.
+    """
+
+    def __init__(self, url: str = URL, schema_ttl: int = SCHEMA_TTL, validar: bool = True,
+                 persistidas: bool = True, timeout: float = 10.0):
+        super().__init__(url, schema_ttl, validar, persistidas)
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def schema(self):
+        if self._schema is None:
+            self._schema = schema_cacheado(self.url, self.schema_ttl, self.session)
+        return self._schema
+
+    def _post(self, cuerpo):
+        respuesta = self.session.post(self.url, json=cuerpo, timeout=self.timeout)
+        if respuesta.status_code != 200:
+            raise Exception(f"Query failed to run by returning code of {respuesta.status_code}. {respuesta.text}")
+        return respuesta.json()
+
+    def ejecutar(self, query: str, variables: dict = None) -> dict:
+        resultado = self.ejecutar_lote([(query, variables)])[0]
+        if isinstance(resultado, ErrorGraphQL):
+            raise resultado
+        return resultado
+
+    def ejecutar_lote(self, operaciones: list) -> list:
+        """Ejecuta `[(query, variables), ...]` en un POST por cada LOTE_MAX operaciones.
+
+        Devuelve, en el mismo orden, el `data` de cada operacion o un ErrorGraphQL.
+        """
+        if self.validar:
+            self.schema()
+        resultados = [self._errores_locales(q) for q, _ in operaciones]
+        pendientes = [i for i, r in enumerate(resultados) if r is None]
+        for inicio in range(0, len(pendientes), LOTE_MAX):
+            indices = pendientes[inicio:inicio + LOTE_MAX]
+            for i, resultado in zip(indices, self._enviar([operaciones[i] for i in indices])):
+                resultados[i] = _datos(resultado)
+        return resultados
+
+    def _enviar(self, operaciones: list) -> list:
+        # una sola operacion va como objeto; el servidor solo acepta listas si hay lote
+        if len(operaciones) == 1:
+            enviar = lambda cuerpos: [self._post(cuerpos[0])]
+        else:
+            enviar = self._post
+        resultados = enviar(self._lote(operaciones, con_texto=False))
+        faltan = [i for i, r in enumerate(resultados) if _no_encontrada(r)]
+        if faltan:
+            reintento = enviar(self._lote([operaciones[i] for i in faltan], con_texto=True))
+            for i, resultado in zip(faltan, reintento):
+                resultados[i] = resultado
+        return resultados
+
+    def cerrar(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class ClienteGraphQLAsync(_Base):
+    """Variante async sobre un httpx.AsyncClient compartido.
+
+    Con `agrupar=True` las llamadas concurrentes a `ejecutar` que llegan dentro
+    de `espera_lote` segundos se envian juntas como un lote (hasta LOTE_MAX).
+    """
+
+    def __init__(self, url: str = URL, schema_ttl: int = SCHEMA_TTL, validar: bool = True,
+                 persistidas: bool = True, agrupar: bool = False,
+                 espera_lote: float = LOTE_ESPERA, timeout: float = 10.0):
+        super().__init__(url, schema_ttl, validar, persistidas)
+        self.agrupar = agrupar
+        self.espera_lote = espera_lote
+        self.http = httpx.AsyncClient(timeout=timeout)
+        self._pendientes = []
+        self._temporizador = None
+        self._envios = set()
+
+    async def schema(self):
+        if self._schema is None:
+            introspeccion = leer_schema_cache(self.url, self.schema_ttl)
+            if introspeccion is None:
+                respuesta = await self.http.post(self.url, json={"query": get_introspection_query()})
+                respuesta.raise_for_status()
+                introspeccion = respuesta.json()["data"]
+                guardar_schema_cache(self.url, introspeccion)
+            self._schema = build_client_schema(introspeccion)
+        return self._schema
+
+    async def _post(self, cuerpo):
+        respuesta = await self.http.post(self.url, json=cuerpo)
+        if respuesta.status_code != 200:
+            raise Exception(f"Query failed to run by returning code of {respuesta.status_code}. {respuesta.text}")
+        return respuesta.json()
+
+    async def ejecutar(self, query: str, variables: dict = None) -> dict:
+        if self.validar:
+            await self.schema()
+        error = self._errores_locales(query)
+        if error is not None:
+            raise error
+
+        if not self.agrupar:
+            resultado = _datos((await self._enviar([(query, variables)]))[0])
+        else:
+            futuro = asyncio.get_running_loop().create_future()
+            self._pendientes.append(((query, variables), futuro))
+            if len(self._pendientes) >= LOTE_MAX:
+                self._despachar()
+            elif self._temporizador is None:
+                self._temporizador = asyncio.get_running_loop().call_later(self.espera_lote, self._despachar)
+            resultado = await futuro
+
+        if isinstance(resultado, ErrorGraphQL):
+            raise resultado
+        return resultado
+
+    def _despachar(self):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        pendientes, self._pendientes = self._pendientes, []
+        if pendientes:
+            # se guarda la tarea para que no la recolecte el GC antes de terminar
+            tarea = asyncio.get_running_loop().create_task(self._enviar_pendientes(pendientes))
+            self._envios.add(tarea)
+            tarea.add_done_callback(self._envios.discard)
+
+    async def _enviar_pendientes(self, pendientes: list):
+        try:
+            resultados = await self._enviar([operacion for operacion, _ in pendientes])
+        except Exception as exc:
+            for _, futuro in pendientes:
+                if not futuro.done():
+                    futuro.set_exception(exc)
+            return
+        for (_, futuro), resultado in zip(pendientes, resultados):
+            if not futuro.done():
+                futuro.set_result(_datos(resultado))
+
+    async def _enviar(self, operaciones: list) -> list:
+        if len(operaciones) == 1:
+            async def enviar(cuerpos):
+                return [await self._post(cuerpos[0])]
+        else:
+            enviar = self._post
+        resultados = await enviar(self._lote(operaciones, con_texto=False))
+        faltan = [i for i, r in enumerate(resultados) if _no_encontrada(r)]
+        if faltan:
+            reintento = await enviar(self._lote([operaciones[i] for i in faltan], con_texto=True))
+            for i, resultado in zip(faltan, reintento):
+                resultados[i] = resultado
+        return resultados
+
+    async def cerrar(self):
+        self._despachar()
+        if self._envios:
+            await asyncio.gather(*self._envios, return_exceptions=True)
+        await self.http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.cerrar()
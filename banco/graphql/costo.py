@@ -0,0 +1,136 @@
+# costo.py
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    InlineFragmentNode,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+    value_from_ast_untyped,
+)
+from graphql.utilities import get_operation_ast
+from strawberry.extensions import SchemaExtension
+from paginacion import PAGINA_DEFECTO, PAGINA_MAX
+
+# Presupuestos por operacion
+PROFUNDIDAD_MAX = 8
+COSTO_MAX = 20000
+# Elementos estimados para listas sin argumento `first` (p.ej. Cliente.cuentas)
+LISTA_DEFECTO = 10
+
+# El nombre de operacion lo elige el cliente: pasado este limite de nombres
+# distintos, las operaciones nuevas se acumulan en OPERACIONES_OTRAS
+METRICAS_MAX_OPERACIONES = 200
+OPERACIONES_OTRAS = "(otras)"
+
+metricas_costo = {}
+
+
+def _tamanio_pagina(campo: FieldNode, variables: dict) -> int:
+    """Elementos que devuelve un campo paginado: `first` acotado, o PAGINA_DEFECTO."""
+    for argumento in campo.arguments or ():
+        if argumento.name.value == "first":
+            valor = value_from_ast_untyped(argumento.value, variables)
+            if valor is not None:
+                return max(0, min(int(valor), PAGINA_MAX))
+    return PAGINA_DEFECTO
+
+
+class _Analisis:
+
+    def __init__(self, schema, documento, variables: dict):
+        self.schema = schema
+        self.variables = variables or {}
+        self.fragmentos = {
+            d.name.value: d for d in documento.definitions if d.kind == "fragment_definition"
+        }
+
+    def recorrer(self, seleccion, tipo, multiplicador: int, profundidad: int):
+        """Devuelve (costo, profundidad maxima) de un selection set."""
+        costo, maxima = 0, profundidad
+        for nodo in seleccion.selections:
+            if isinstance(nodo, FieldNode):
+                c, p = self._campo(nodo, tipo, multiplicador, profundidad)
+            elif isinstance(nodo, InlineFragmentNode):
+                subtipo = self.schema.get_type(nodo.type_condition.name.value) if nodo.type_condition else tipo
+                c, p = self.recorrer(nodo.selection_set, subtipo, multiplicador, profundidad)
+            elif isinstance(nodo, FragmentSpreadNode):
+                fragmento = self.fragmentos[nodo.name.value]
+                subtipo = self.schema.get_type(fragmento.type_condition.name.value)
+                c, p = self.recorrer(fragmento.selection_set, subtipo, multiplicador, profundidad)
+            costo += c
+            maxima = max(maxima, p)
+        return costo, maxima
+
+    def _campo(self, nodo: FieldNode, tipo, multiplicador: int, profundidad: int):
+        nombre = nodo.name.value
+        if nombre.startswith("__") or not hasattr(tipo, "fields"):
+            return 0, profundidad
+        definicion = tipo.fields[nombre]
+        # cada campo cuesta una unidad por cada vez que se resuelve
+        costo = multiplicador
+        if not nodo.selection_set:
+            return costo, profundidad + 1
+
+        tipo_campo = get_nullable_type(definicion.type)
+        if "first" in definicion.args:
+            hijos = multiplicador * _tamanio_pagina(nodo, self.variables)
+        elif is_list_type(tipo_campo) and nombre != "edges":
+            # `edges` de una conexion ya fue multiplicado por `first`
+            hijos = multiplicador * LISTA_DEFECTO
+        else:
+            hijos = multiplicador
+        c, p = self.recorrer(nodo.selection_set, get_named_type(tipo_campo), hijos, profundidad + 1)
+        return costo + c, p
+
+
+def calcular_costo(schema, documento, operation_name, variables) -> tuple:
+    operacion = get_operation_ast(documento, operation_name)
+    if operacion is None:
+        return 0, 0
+    raiz = schema.get_root_type(operacion.operation)
+    return _Analisis(schema, documento, variables).recorrer(operacion.selection_set, raiz, 1, 0)
+
+
+def _registrar(operacion: str, costo: int, rechazada: bool):
+    if operacion not in metricas_costo and len(metricas_costo) >= METRICAS_MAX_OPERACIONES:
+        operacion = OPERACIONES_OTRAS
+    m = metricas_costo.setdefault(operacion, {"ejecuciones": 0, "rechazadas": 0, "costo_total": 0, "costo_max": 0})
+    m["ejecuciones"] += 1
+    m["rechazadas"] += int(rechazada)
+    m["costo_total"] += costo
+    m["costo_max"] = max(m["costo_max"], costo)
+
+
+class LimiteCosto(SchemaExtension):
+    """Rechaza antes de ejecutar las operaciones demasiado profundas o costosas.
+
+    El costo estima cuantas veces se resuelve cada campo: las listas multiplican
+    a sus hijos por `first` (o PAGINA_DEFECTO en conexiones, LISTA_DEFECTO en
+    listas simples). Se calcula en cada request porque `first` puede venir en
+    variables.
+    """
+
+    def on_execute(self):
+        contexto = self.execution_context
+        costo, profundidad = calcular_costo(
+            contexto.schema._schema,
+            contexto.graphql_document,
+            contexto.operation_name,
+            contexto.variables,
+        )
+        operacion = contexto.operation_name or "anonima"
+        rechazada = profundidad > PROFUNDIDAD_MAX or costo > COSTO_MAX
+        _registrar(operacion, costo, rechazada)
+        if profundidad > PROFUNDIDAD_MAX:
+            raise GraphQLError(
+                f"Profundidad {profundidad} supera el maximo de {PROFUNDIDAD_MAX}",
+                extensions={"code": "QUERY_TOO_DEEP", "profundidad": profundidad},
+            )
+        if costo > COSTO_MAX:
+            raise GraphQLError(
+                f"Costo estimado {costo} supera el maximo de {COSTO_MAX}",
+                extensions={"code": "QUERY_TOO_COSTLY", "costo": costo},
+            )
+        yield
@@ -0,0 +1,70 @@
+# eventos.py
+import asyncio
+from typing import AsyncGenerator, Optional
+
+# Eventos pendientes por suscriptor; si se llena, el suscriptor se descarta
+COLA_MAX = 100
+
+
+class SuscriptorLento(Exception):
+    pass
+
+
+class _Suscriptor:
+    def __init__(self):
+        self.cola = asyncio.Queue(maxsize=COLA_MAX)
+        self.descartado = False
+
+
+class Difusor:
+    """Reparte eventos por topico (id de cuenta, o None para todas las cuentas).
+
+    `publicar` nunca espera: el evento se construye una vez y se encola sin
+    bloqueo en cada suscriptor del topico. Un suscriptor cuya cola esta llena
+    se descarta en lugar de frenar al publicador.
+    """
+
+    def __init__(self):
+        self._topicos = {}
+        self.publicados = 0
+        self.descartados = 0
+
+    def publicar(self, topico, evento):
+        self.publicados += 1
+        for clave in (topico, None):
+            for suscriptor in list(self._topicos.get(clave, ())):
+                try:
+                    suscriptor.cola.put_nowait(evento)
+                except asyncio.QueueFull:
+                    self._descartar(clave, suscriptor)
+
+    def _descartar(self, topico, suscriptor: _Suscriptor):
+        self.descartados += 1
+        suscriptor.descartado = True
+        self._topicos[topico].discard(suscriptor)
+        # se vacia la cola para que el consumidor vea el descarte enseguida
+        while not suscriptor.cola.empty():
+            suscriptor.cola.get_nowait()
+        suscriptor.cola.put_nowait(None)
+
+    async def suscribir(self, topico: Optional[int]) -> AsyncGenerator:
+        suscriptor = _Suscriptor()
+        self._topicos.setdefault(topico, set()).add(suscriptor)
+        try:
+            while True:
+                evento = await suscriptor.cola.get()
+                if evento is None and suscriptor.descartado:
+                    raise SuscriptorLento("Suscripcion cancelada: el cliente no consume los eventos a tiempo")
+                yield evento
+        finally:
+            self._topicos.get(topico, set()).discard(suscriptor)
+
+    def estado(self) -> dict:
+        return {
+            "suscriptores": sum(len(s) for s in self._topicos.values()),
+            "publicados": self.publicados,
+            "descartados": self.descartados,
+        }
+
+
+pagos_creados = Difusor()
@@ -1,29 +1,35 @@
 # client_gql.py
 from gql import gql, Client
 from gql.transport.requests import RequestsHTTPTransport
+from cliente import URL, schema_cacheado
 
-def get_clients_named(name):
-    transport = RequestsHTTPTransport(
-        url='http://localhost:8000/graphql',
-        use_json=True,
-    )
+# transporte y cliente se crean una vez; el schema sale del cache en disco en lugar
+# de una introspeccion por llamada (fetch_schema_from_transport)
+transport = RequestsHTTPTransport(url=URL, use_json=True)
+client = Client(transport=transport, schema=schema_cacheado(URL))
+# connect_sync deja abierta la sesion HTTP del transporte; client.execute la abre y cierra cada vez
+session = client.connect_sync()
 
-    client = Client(transport=transport, fetch_schema_from_transport=True)
 
+def get_clients_named(name):
     query = gql("""
     query ($name: String) {
       allClientes(nombre: $name) {
-        id
-        cedula
-        nombre
-        apellido
+        edges {
+          node {
+            id
+            cedula
+            nombre
+            apellido
+          }
+        }
       }
     }
     """)
 
     params = {"name": name}
-    result = client.execute(query, variable_values=params)
-    return result['allClientes']
+    result = session.execute(query, variable_values=params)
+    return [edge['node'] for edge in result['allClientes']['edges']]
 
 if __name__ == "__main__":
     nombre = "eduardo"
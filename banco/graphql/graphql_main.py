@@ -1,15 +1,77 @@
 # main.py
-from fastapi import FastAPI
+import os
+import sys
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
+from graphql import graphql
 from strawberry.fastapi import GraphQLRouter
 from schema import schema
+from loaders import crear_loaders
+from models import estado_pool, get_session, init_db, precalentar
+from persistidas import documentos
+from costo import metricas_costo
+from eventos import pagos_creados
+from cache_respuestas import respuestas
 
-app = FastAPI()
+# compresion.py vive en la carpeta banco, compartido con BancoBaseAPI
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compresion import CompresionMiddleware
 
 
-graphql_app = GraphQLRouter(schema)
+@asynccontextmanager
+async def lifespan(app):
+    # la base se prepara al arrancar el worker y no al importar el modulo; con la
+    # base ya inicializada init_db solo lee PRAGMA user_version
+    init_db()
+    await precalentar()
+    # la primera ejecucion de graphql-core hace imports y compilaciones perezosas;
+    # se ejecuta directo en graphql-core para no pasar por las extensiones del
+    # schema (metricas, cache) con una consulta que no hizo ningun cliente
+    await graphql(schema._schema, "{ __typename }")
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+
+# misma configuracion que BancoBaseAPI (valores por defecto de compresion.py)
+app.add_middleware(CompresionMiddleware)
+
+
+async def get_context(session=Depends(get_session)):
+    # la sesion del request solo se usa para escribir y se cierra al terminar; cada
+    # lectura de resolvers y loaders toma su propia conexion del pool (acceso.leer)
+    return {"session": session, "loaders": crear_loaders(session)}
+
+
+graphql_app = GraphQLRouter(schema, context_getter=get_context)
 
 app.include_router(graphql_app, prefix="/graphql")
 
+
+@app.get("/metrics/pool")
+def metricas_pool():
+    return estado_pool()
+
+
+@app.get("/metrics/documentos")
+def metricas_documentos():
+    return documentos.estado()
+
+
+@app.get("/metrics/costo")
+def metricas_costo_operaciones():
+    return metricas_costo
+
+
+@app.get("/metrics/suscripciones")
+def metricas_suscripciones():
+    return pagos_creados.estado()
+
+
+@app.get("/metrics/cache")
+def metricas_cache():
+    return respuestas.estado()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,50 @@
+# loaders.py
+from collections import defaultdict
+from typing import List, Tuple
+from strawberry.dataloader import DataLoader
+from sqlalchemy import select
+from models import Cuenta as CuentaModel, Pagos as PagosModel
+from proyeccion import atributos
+from acceso import leer
+
+
+def _agrupar(filas, clave: str, keys: List[int]) -> List[list]:
+    grupos = defaultdict(list)
+    for fila in filas:
+        grupos[getattr(fila, clave)].append(fila)
+    # DataLoader espera los resultados en el mismo orden que las keys
+    return [grupos.get(key, []) for key in keys]
+
+
+async def _cargar_proyectado(session, modelo, clave: str, keys: List[Tuple[int, tuple]]) -> List[list]:
+    """Carga hijos de varios padres con las columnas pedidas.
+
+    Cada key es `(id_padre, columnas)`. Se hace una consulta `IN (...)` por
+    cada conjunto distinto de columnas (normalmente uno solo por nivel).
+    """
+    por_columnas = defaultdict(list)
+    for id_padre, nombres in keys:
+        por_columnas[nombres].append(id_padre)
+
+    resultados = {}
+    for nombres, ids in por_columnas.items():
+        stmt = select(*atributos(modelo, nombres)).where(getattr(modelo, clave).in_(ids))
+        filas = await leer(session, stmt)
+        for id_padre, grupo in zip(ids, _agrupar(filas, clave, ids)):
+            resultados[(id_padre, nombres)] = grupo
+    return [resultados[key] for key in keys]
+
+
+def crear_loaders(session) -> dict:
+    """Loaders nuevos por request: el cache de un DataLoader no se comparte entre requests."""
+
+    async def cargar_cuentas_por_cliente(keys: List[Tuple[int, tuple]]) -> List[list]:
+        return await _cargar_proyectado(session, CuentaModel, "cliente_id", keys)
+
+    async def cargar_pagos_por_cuenta(keys: List[Tuple[int, tuple]]) -> List[list]:
+        return await _cargar_proyectado(session, PagosModel, "cuenta_id", keys)
+
+    return {
+        "cuentas_por_cliente": DataLoader(load_fn=cargar_cuentas_por_cliente),
+        "pagos_por_cuenta": DataLoader(load_fn=cargar_pagos_por_cuenta),
+    }
@@ -1,10 +1,27 @@
 # models.py
-from sqlalchemy import Column, Integer, String, ForeignKey, create_engine
+import os
+import time
+from sqlalchemy import Column, Integer, String, ForeignKey, create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import configure_mappers, sessionmaker, relationship
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.schema import CreateIndex
 
 DATABASE_URL = "sqlite:///../banco_gql.db"
 
+# Con BANCO_ASYNC_DB=1 los resolvers usan AsyncSession sobre aiosqlite
+# (pip install aiosqlite) en lugar de bloquear el event loop con Session.
+ASYNC_DB = os.getenv("BANCO_ASYNC_DB", "0") == "1"
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///../banco_gql.db"
+
+# Pool de conexiones. Cada lectura (un resolver o un lote de un DataLoader) toma
+# una conexion solo mientras dura su SELECT y las escrituras usan la de la sesion
+# del request, asi que un request puede tener varias a la vez. POOL_SIZE +
+# MAX_OVERFLOW acota cuantas consultas corren a la vez, no cuantos requests.
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+POOL_TIMEOUT = 10
+
 Base = declarative_base()
 
 class Cliente(Base):
@@ -26,13 +43,158 @@ class Cuenta(Base):
 class Pagos(Base):
     __tablename__ = "pagos"
     id = Column(Integer, primary_key=True, index=True)
-    cuenta_id = Column(Integer, ForeignKey('cuentas.id'))
+    cuenta_id = Column(Integer, ForeignKey('cuentas.id'), index=True)
     monto = Column(Integer)
     moneda = Column(String)
     numero_factura = Column(String)
     cuenta = relationship("Cuenta", back_populates="pagos")
 
 
-engine = create_engine(DATABASE_URL)
+metricas_pool = {
+    "checkouts": 0,
+    "checkins": 0,
+    "espera_total_ms": 0.0,
+    "espera_max_ms": 0.0,
+    "timeouts": 0,
+}
+
+
+class _MedirEspera:
+    """Registra cuanto espera cada checkout por una conexion libre."""
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            metricas_pool["timeouts"] += 1
+            raise
+        finally:
+            espera = (time.perf_counter() - inicio) * 1000
+            metricas_pool["espera_total_ms"] += espera
+            metricas_pool["espera_max_ms"] = max(metricas_pool["espera_max_ms"], espera)
+
+
+class PoolMedido(_MedirEspera, QueuePool):
+    pass
+
+
+class PoolMedidoAsync(_MedirEspera, AsyncAdaptedQueuePool):
+    pass
+
+
+def estado_pool() -> dict:
+    pool = async_engine.sync_engine.pool if ASYNC_DB else engine.pool
+    return {
+        **metricas_pool,
+        "async": ASYNC_DB,
+        "pool_size": pool.size(),
+        "en_uso": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=PoolMedido,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+)
+engines_medidos = [engine]
+
+if ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=PoolMedidoAsync,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+    )
+    # sin expire_on_commit: tras el commit no se puede recargar atributos de forma implicita
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    engines_medidos.append(async_engine.sync_engine)
+
+
+def configurar_sqlite(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")  # lectores no bloquean al escritor
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA cache_size=-16000")  # ~16 MB por conexion
+    cursor.close()
+
+
+def contar_checkout(dbapi_connection, connection_record, connection_proxy):
+    metricas_pool["checkouts"] += 1
+
+
+def contar_checkin(dbapi_connection, connection_record):
+    metricas_pool["checkins"] += 1
+
+
+for _engine in engines_medidos:
+    event.listen(_engine, "connect", configurar_sqlite)
+    event.listen(_engine, "checkout", contar_checkout)
+    event.listen(_engine, "checkin", contar_checkin)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base.metadata.create_all(bind=engine)
+
+# Version del esquema de la base; subirla al cambiar tablas o indices
+ESQUEMA_VERSION = 1
+
+
+def init_db():
+    """Crea tablas e indices faltantes una vez por version del esquema.
+
+    Se llama al arrancar la app, no al importar el modulo. La version aplicada
+    queda en PRAGMA user_version, asi un worker nuevo sobre una base ya
+    inicializada solo lee ese valor en lugar de repetir create_all.
+    """
+    with engine.connect() as conexion:
+        if conexion.exec_driver_sql("PRAGMA user_version").scalar() >= ESQUEMA_VERSION:
+            return
+    Base.metadata.create_all(bind=engine)
+    # create_all no agrega indices nuevos a tablas que ya existen.
+    # IF NOT EXISTS evita la carrera cuando arrancan varios workers a la vez.
+    with engine.begin() as conexion:
+        for tabla in Base.metadata.sorted_tables:
+            for indice in tabla.indexes:
+                conexion.execute(CreateIndex(indice, if_not_exists=True))
+        conexion.exec_driver_sql(f"PRAGMA user_version = {ESQUEMA_VERSION}")
+
+
+def get_session_sync():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+async def get_session_async():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+get_session = get_session_async if ASYNC_DB else get_session_sync
+
+
+async def precalentar():
+    """Deja hecho al arrancar el trabajo que si no pagaria el primer request.
+
+    Configura los mappers del ORM y abre una conexion (con sus PRAGMA) del pool
+    que usan los requests: el de aiosqlite con BANCO_ASYNC_DB=1.
+    """
+    configure_mappers()
+    if ASYNC_DB:
+        async with async_engine.connect():
+            pass
+    else:
+        with engine.connect():
+            pass
@@ -0,0 +1,76 @@
+# paginacion.py
+from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+import strawberry
+from sqlalchemy import func, select
+from strawberry.relay import from_base64, to_base64
+from acceso import leer
+
+# Tamaños de pagina: sin `first` se devuelve PAGINA_DEFECTO y nunca mas de PAGINA_MAX
+PAGINA_DEFECTO = 50
+PAGINA_MAX = 200
+
+T = TypeVar("T")
+
+
+@strawberry.type
+class PageInfo:
+    has_next_page: bool
+    end_cursor: Optional[str]
+
+
+@strawberry.type
+class Edge(Generic[T]):
+    node: T
+    cursor: str
+
+
+@strawberry.type
+class Connection(Generic[T]):
+    edges: List[Edge[T]]
+    page_info: PageInfo
+    contar: strawberry.Private[Callable[[], Awaitable[int]]]
+
+    @strawberry.field
+    async def total_count(self) -> int:
+        # el COUNT solo se ejecuta si la consulta pide totalCount
+        return await self.contar()
+
+
+def codificar_cursor(tipo: str, id: int) -> str:
+    return to_base64(tipo, id)
+
+
+def decodificar_cursor(tipo: str, cursor: str) -> int:
+    try:
+        tipo_cursor, id = from_base64(cursor)
+        if tipo_cursor != tipo:
+            raise ValueError
+        return int(id)
+    except ValueError:
+        raise ValueError(f"Cursor invalido para {tipo}: {cursor}") from None
+
+
+async def paginar(session, stmt, modelo, first: Optional[int], after: Optional[str]) -> Connection:
+    """Pagina `stmt` por clave primaria (keyset): WHERE id > cursor ORDER BY id LIMIT first + 1.
+
+    La fila extra solo indica si hay pagina siguiente.
+    """
+    tipo = modelo.__tablename__
+    first = PAGINA_DEFECTO if first is None else max(0, min(first, PAGINA_MAX))
+    pagina = stmt
+    if after:
+        pagina = pagina.where(modelo.id > decodificar_cursor(tipo, after))
+    filas = await leer(session, pagina.order_by(modelo.id).limit(first + 1))
+    hay_mas = len(filas) > first
+    filas = filas[:first]
+    edges = [Edge(node=fila, cursor=codificar_cursor(tipo, fila.id)) for fila in filas]
+
+    async def contar() -> int:
+        total = select(func.count()).select_from(stmt.order_by(None).subquery())
+        return (await leer(session, total))[0][0]
+
+    return Connection(
+        edges=edges,
+        page_info=PageInfo(has_next_page=hay_mas, end_cursor=edges[-1].cursor if edges else None),
+        contar=contar,
+    )
@@ -0,0 +1,83 @@
+# persistidas.py
+import hashlib
+from collections import OrderedDict
+from graphql import GraphQLError
+from strawberry.extensions import SchemaExtension
+
+# Cantidad maxima de documentos parseados y validados que se guardan
+MAX_DOCUMENTOS = 256
+
+
+class CacheDocumentos:
+    """LRU de documentos GraphQL ya parseados y validados, por hash sha256 del texto."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._documentos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave: str):
+        entrada = self._documentos.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self._documentos.move_to_end(clave)
+        self.aciertos += 1
+        return entrada
+
+    def guardar(self, clave: str, query: str, documento):
+        self._documentos[clave] = (query, documento)
+        self._documentos.move_to_end(clave)
+        while len(self._documentos) > self.maxsize:
+            self._documentos.popitem(last=False)
+
+    def estado(self) -> dict:
+        return {
+            "documentos": len(self._documentos),
+            "maxsize": self.maxsize,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+        }
+
+
+documentos = CacheDocumentos(MAX_DOCUMENTOS)
+
+
+def hash_query(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class ConsultasPersistidas(SchemaExtension):
+    """Automatic persisted queries (protocolo de Apollo).
+
+    El cliente envia `extensions.persistedQuery.sha256Hash`. Si el hash esta en
+    cache se reutiliza el documento ya parseado y validado, sin texto en el
+    request. Si no esta y no vino `query`, se responde PersistedQueryNotFound y
+    el cliente reintenta con el texto completo, que queda guardado. Las
+    consultas sin hash tambien se guardan, usando el sha256 de su texto.
+    """
+
+    def on_operation(self):
+        contexto = self.execution_context
+        extensiones = contexto.operation_extensions or {}
+        persistida = extensiones.get("persistedQuery") or {}
+        clave = persistida.get("sha256Hash")
+
+        if clave and contexto.query and hash_query(contexto.query) != clave:
+            raise GraphQLError("provided sha does not match query", extensions={"code": "INTERNAL_SERVER_ERROR"})
+        if clave is None and contexto.query:
+            clave = hash_query(contexto.query)
+
+        entrada = documentos.obtener(clave) if clave else None
+        if entrada is not None:
+            contexto.query, contexto.graphql_document = entrada
+            # ya se valido cuando se guardo; strawberry omite validar si no es None
+            contexto.pre_execution_errors = []
+        elif not contexto.query:
+            raise GraphQLError("PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"})
+
+        yield
+
+        if entrada is None and contexto.graphql_document is not None and not contexto.pre_execution_errors:
+            documentos.guardar(clave, contexto.query, contexto.graphql_document)
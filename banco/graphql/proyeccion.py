@@ -0,0 +1,55 @@
+# proyeccion.py
+import re
+from typing import Iterable, List
+from strawberry.types import Info
+from strawberry.types.nodes import FragmentSpread, InlineFragment
+
+
+def _snake(nombre: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", nombre).lower()
+
+
+def _nombres(selecciones) -> set:
+    nombres = set()
+    for seleccion in selecciones:
+        if isinstance(seleccion, (FragmentSpread, InlineFragment)):
+            # fragmentos (inline o con nombre): se expanden sus campos
+            nombres |= _nombres(seleccion.selections)
+        else:
+            nombres.add(_snake(seleccion.name))
+    return nombres
+
+
+def _hijo(selecciones, nombre: str) -> list:
+    hijas = []
+    for seleccion in selecciones:
+        if isinstance(seleccion, (FragmentSpread, InlineFragment)):
+            hijas += _hijo(seleccion.selections, nombre)
+        elif seleccion.name == nombre:
+            hijas += seleccion.selections
+    return hijas
+
+
+def campos_pedidos(info: Info, *ruta: str) -> set:
+    """Nombres (snake_case) de los campos pedidos debajo del campo actual.
+
+    `ruta` baja por campos intermedios, p.ej. ("edges", "node") en una conexion.
+    """
+    selecciones = info.selected_fields[0].selections
+    for nombre in ruta:
+        selecciones = _hijo(selecciones, nombre)
+    return _nombres(selecciones)
+
+
+def columnas(modelo, nombres: Iterable[str], requeridas: Iterable[str] = ("id",)) -> List[str]:
+    """Columnas de `modelo` a consultar: las pedidas mas las `requeridas`.
+
+    Las requeridas son las que usan los resolvers anidados (id) o los loaders
+    para agrupar (claves foraneas).
+    """
+    tabla = modelo.__table__.c
+    return list(requeridas) + sorted(n for n in nombres if n in tabla and n not in requeridas)
+
+
+def atributos(modelo, nombres: Iterable[str]) -> list:
+    return [getattr(modelo, nombre) for nombre in nombres]
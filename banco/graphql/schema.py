@@ -1,10 +1,17 @@
 import strawberry
 import typing
-from typing import List, Optional, Union
+from typing import AsyncGenerator, List, Optional, Union
+from strawberry.schema.config import StrawberryConfig
 from strawberry.types import Info
-from models import Cliente as ClienteModel, Cuenta as CuentaModel, Pagos as PagosModel, SessionLocal
-from sqlalchemy.orm import Session
-from sqlalchemy.orm import joinedload
+from models import Cliente as ClienteModel, Cuenta as CuentaModel, Pagos as PagosModel
+from sqlalchemy import func, insert, select
+from acceso import escribir, guardar, leer
+from proyeccion import atributos, campos_pedidos, columnas
+from paginacion import Connection, paginar
+from persistidas import ConsultasPersistidas
+from costo import LimiteCosto
+from eventos import pagos_creados
+from cache_respuestas import CacheConsultas, respuestas
 
 
 @strawberry.type
@@ -12,7 +19,12 @@ class Cuenta:
     id: int
     cliente_id: int
     cuenta: int
-    pagos: List["Pago"]
+
+    @strawberry.field
+    async def pagos(self, info: Info) -> List["Pago"]:
+        # se resuelve solo si la consulta pide pagos; un IN (...) por nivel
+        nombres = columnas(PagosModel, campos_pedidos(info), requeridas=("id", "cuenta_id"))
+        return await info.context["loaders"]["pagos_por_cuenta"].load((self.id, tuple(nombres)))
 
 @strawberry.type
 class Pago:
@@ -22,80 +34,193 @@ class Pago:
     moneda: str
     numero_factura: str
 
+@strawberry.input
+class PagoInput:
+    cuenta_id: int
+    monto: int
+    moneda: str
+    numero_factura: str
+
+@strawberry.type
+class TotalMoneda:
+    moneda: str
+    cantidad: int
+    suma: int
+    maximo: int
+
+@strawberry.type
+class PagosPorCuenta:
+    cuenta_id: int
+    session: strawberry.Private[typing.Any]
+
+    @strawberry.field
+    async def pagos(
+        self, info: Info, first: Optional[int] = None, after: Optional[str] = None,
+    ) -> Connection[Pago]:
+        nombres = columnas(PagosModel, campos_pedidos(info, "edges", "node"))
+        stmt = select(*atributos(PagosModel, nombres)).where(PagosModel.cuenta_id == self.cuenta_id)
+        return await paginar(self.session, stmt, PagosModel, first, after)
+
+    @strawberry.field
+    async def totales(self) -> List[TotalMoneda]:
+        # agregados calculados en SQL con un solo GROUP BY
+        stmt = (
+            select(
+                PagosModel.moneda,
+                func.count(PagosModel.id),
+                func.sum(PagosModel.monto),
+                func.max(PagosModel.monto),
+            )
+            .where(PagosModel.cuenta_id == self.cuenta_id)
+            .group_by(PagosModel.moneda)
+        )
+        filas = await leer(self.session, stmt)
+        return [
+            TotalMoneda(moneda=moneda, cantidad=cantidad, suma=suma, maximo=maximo)
+            for moneda, cantidad, suma, maximo in filas
+        ]
+
+def publicar_pagos(pagos):
+    # el evento se arma una sola vez y se comparte entre todos los suscriptores
+    for pago in pagos:
+        evento = Pago(
+            id=pago.id, cuenta_id=pago.cuenta_id, monto=pago.monto,
+            moneda=pago.moneda, numero_factura=pago.numero_factura,
+        )
+        pagos_creados.publicar(pago.cuenta_id, evento)
+
 @strawberry.type
 class Cliente:
     id: int
     cedula: str
     nombre: str
     apellido: str
-    cuentas: List[Cuenta]
+
+    @strawberry.field
+    async def cuentas(self, info: Info) -> List[Cuenta]:
+        nombres = columnas(CuentaModel, campos_pedidos(info), requeridas=("id", "cliente_id"))
+        return await info.context["loaders"]["cuentas_por_cliente"].load((self.id, tuple(nombres)))
 
 @strawberry.type
 class Query:
 
     # @strawberry.field
     # def all_clientes(self, info: Info) -> List[Cliente]:
-    #     session = SessionLocal()
+    #     session = info.context["session"]
     #     clientes = session.query(ClienteModel).all()
     #     return clientes
 
     @strawberry.field
-    def all_clientes(self, info: Info, nombre: Optional[str] = None) -> List[Cliente]:
-        session = SessionLocal()
-        query = session.query(ClienteModel).options(
-                joinedload(ClienteModel.cuentas).joinedload(CuentaModel.pagos)
-            )
+    async def all_clientes(
+        self, info: Info, nombre: Optional[str] = None,
+        first: Optional[int] = None, after: Optional[str] = None,
+    ) -> Connection[Cliente]:
+        session = info.context["session"]
+        # solo las columnas pedidas; filas planas, sin pasar por el identity map
+        nombres = columnas(ClienteModel, campos_pedidos(info, "edges", "node"))
+        stmt = select(*atributos(ClienteModel, nombres))
         if nombre:
-            query = query.filter(ClienteModel.nombre == nombre)
-        clientes = query.all()
-        return clientes
+            stmt = stmt.where(ClienteModel.nombre == nombre)
+        return await paginar(session, stmt, ClienteModel, first, after)
     
     @strawberry.field
-    def pagos_por_cuenta(self, info: Info, cuenta: int) -> List[Pago]:
-       '''A IMPLEMENTAR'''
-       return None
+    def pagos_por_cuenta(self, info: Info, cuenta: int) -> PagosPorCuenta:
+        # `cuenta` es el id de la cuenta; pagos y totales se consultan solo si se piden
+        return PagosPorCuenta(cuenta_id=cuenta, session=info.context["session"])
 
     @strawberry.field
-    def all_cuentas(self, info: Info) -> List[Cuenta]:
-        session = SessionLocal()
-        cuentas = session.query(CuentaModel).all()
-        return cuentas
+    async def all_cuentas(
+        self, info: Info, first: Optional[int] = None, after: Optional[str] = None,
+    ) -> Connection[Cuenta]:
+        session = info.context["session"]
+        nombres = columnas(CuentaModel, campos_pedidos(info, "edges", "node"))
+        stmt = select(*atributos(CuentaModel, nombres))
+        return await paginar(session, stmt, CuentaModel, first, after)
 
     @strawberry.field
-    def all_pagos(self, info: Info) -> List[Pago]:
-        session = SessionLocal()
-        pagos = session.query(PagosModel).all()
-        return pagos
+    async def all_pagos(
+        self, info: Info, first: Optional[int] = None, after: Optional[str] = None,
+    ) -> Connection[Pago]:
+        session = info.context["session"]
+        nombres = columnas(PagosModel, campos_pedidos(info, "edges", "node"))
+        stmt = select(*atributos(PagosModel, nombres))
+        return await paginar(session, stmt, PagosModel, first, after)
 
 @strawberry.type
 class Mutation:
     @strawberry.mutation
-    def create_cliente(self, info: Info, cedula: str, nombre: str, apellido: str) -> Cliente:
-        session = SessionLocal()
+    async def create_cliente(self, info: Info, cedula: str, nombre: str, apellido: str) -> Cliente:
+        session = info.context["session"]
         cliente = ClienteModel(cedula=cedula, nombre=nombre, apellido=apellido)
-        session.add(cliente)
-        session.commit()
-        session.refresh(cliente)
+        await guardar(session, cliente)
+        respuestas.invalidar("clientes")
         return cliente
 
     @strawberry.mutation
-    def create_cuenta(self, info: Info, cliente_id: int, cuenta: int) -> Cuenta:
-        session = SessionLocal()
+    async def create_cuenta(self, info: Info, cliente_id: int, cuenta: int) -> Cuenta:
+        session = info.context["session"]
         cuenta = CuentaModel(cliente_id=cliente_id, cuenta=cuenta)
-        session.add(cuenta)
-        session.commit()
-        session.refresh(cuenta)
+        await guardar(session, cuenta)
+        respuestas.invalidar("cuentas")
         return cuenta
 
     @strawberry.mutation
-    def create_pago(self, info: Info,cuenta_id: int, monto: int, moneda: str, numero_factura: str) -> Pago:
-        session = SessionLocal()
+    async def create_pago(self, info: Info,cuenta_id: int, monto: int, moneda: str, numero_factura: str) -> Pago:
+        session = info.context["session"]
         pago = PagosModel(cuenta_id=cuenta_id, monto=monto, moneda=moneda, numero_factura=numero_factura)
-        session.add(pago)
-        session.commit()
-        session.refresh(pago)
+        await guardar(session, pago)
+        respuestas.invalidar("pagos")
+        publicar_pagos([pago])
         return pago
+
+    @strawberry.mutation
+    async def create_pagos(self, info: Info, input: List[PagoInput]) -> List[Pago]:
+        session = info.context["session"]
+        # todas las cuentas referenciadas se validan con una sola consulta
+        cuenta_ids = {pago.cuenta_id for pago in input}
+        stmt = select(CuentaModel.id).where(CuentaModel.id.in_(cuenta_ids))
+        existentes = {id for (id,) in await leer(session, stmt)}
+        faltantes = sorted(cuenta_ids - existentes)
+        if faltantes:
+            raise Exception(f"Cuentas inexistentes: {faltantes}")
+        if not input:
+            return []
+
+        # INSERT ... VALUES (...), (...) RETURNING en lotes, sin refresh por fila.
+        # SQLite asigna los ids en orden de insercion, asi que ordenar por id
+        # devuelve los pagos en el orden del input.
+        pagos = await escribir(
+            session,
+            insert(PagosModel).returning(
+                PagosModel.id, PagosModel.cuenta_id, PagosModel.monto,
+                PagosModel.moneda, PagosModel.numero_factura,
+            ),
+            [strawberry.asdict(pago) for pago in input],
+        )
+        pagos = sorted(pagos, key=lambda pago: pago.id)
+        respuestas.invalidar("pagos")
+        publicar_pagos(pagos)
+        return pagos
     
     
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+@strawberry.type
+class Subscription:
+    @strawberry.subscription
+    async def pago_creado(self, info: Info, cuenta_id: Optional[int] = None) -> AsyncGenerator[Pago, None]:
+        # sin cuenta_id se reciben los pagos de todas las cuentas
+        async for pago in pagos_creados.suscribir(cuenta_id):
+            yield pago
+
+
+# un POST con una lista de operaciones las ejecuta en paralelo con el mismo
+# contexto (sesion y DataLoaders) y devuelve la lista de resultados en orden;
+# cada escritura es su propia transaccion (ver acceso.py), asi que una mutacion
+# que falla no revierte ni rompe a las demas del lote
+LOTE_MAX_OPERACIONES = 10
+
+schema = strawberry.Schema(
+    query=Query, mutation=Mutation, subscription=Subscription,
+    extensions=[ConsultasPersistidas, LimiteCosto, CacheConsultas],
+    config=StrawberryConfig(batching_config={"max_operations": LOTE_MAX_OPERACIONES}),
+)
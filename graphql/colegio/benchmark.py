@@ -0,0 +1,190 @@
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import date
+
+import httpx
+
+### Ejecuta una mezcla de consultas y mutaciones contra el endpoint GraphQL de colegio
+# pip install httpx
+
+# Cargar datos y levantar el servidor contando sentencias SQL (dentro de graphql/colegio):
+# python semilla.py --alumnos 20000
+# COLEGIO_CONTAR_SQL=1 uvicorn main:app --port 8000
+
+# Ejecutar el benchmark (pesos relativos de cada operacion en --mezcla):
+# python benchmark.py --solicitudes 2000 --concurrencia 50 --mezcla buscar_alumnos=50,estadisticas=10
+
+URL = "http://localhost:8000/graphql"
+
+OPERACIONES = {
+    "colegios": "{ colegios { id nombre direccion } }",
+    "buscar_alumnos": """
+        query ($nombre: String, $apellido: String) {
+          alumnos(nombre: $nombre, apellido: $apellido, first: 20) { id nombre apellido colegio { nombre } }
+        }
+    """,
+    "alumnos_colegio": """
+        query ($colegio: Int, $offset: Int!) {
+          alumnos(colegioId: $colegio, first: 50, offset: $offset) { id nombre apellido fechaNacimiento }
+        }
+    """,
+    "estadisticas": """
+        query ($anho: Int) {
+          estadisticasMatriculacion(anhoLectivo: $anho, agruparPor: [COLEGIO, CURSO]) { colegioId curso cantidad }
+        }
+    """,
+    "matriculaciones": "{ matriculaciones { id anhoLectivo alumno { nombre colegio { nombre } } materia { nombre } } }",
+    "crear_alumno": """
+        mutation ($nombre: String!, $apellido: String!, $nacimiento: Date!, $colegio: Int!) {
+          crearAlumno(nombre: $nombre, apellido: $apellido, fechaNacimiento: $nacimiento, colegioId: $colegio) { id }
+        }
+    """,
+    "actualizar_alumno": """
+        mutation ($id: Int!, $apellido: String) { actualizarAlumno(alumnoId: $id, apellido: $apellido) { id } }
+    """,
+    "matricular_curso": """
+        mutation ($alumnos: [Int!]!, $materias: [Int!]!, $anho: Int!) {
+          matricularCurso(alumnoIds: $alumnos, materiaIds: $materias, anhoLectivo: $anho) { creadas duplicadas }
+        }
+    """,
+}
+
+# matriculaciones lista la tabla completa: con datos de semilla es la operacion mas pesada
+MEZCLA_DEFECTO = {
+    "colegios": 5, "buscar_alumnos": 40, "alumnos_colegio": 20, "estadisticas": 10,
+    "matriculaciones": 0, "crear_alumno": 10, "actualizar_alumno": 10, "matricular_curso": 5,
+}
+
+FRAGMENTOS = ["edu", "mar", "ana", "lui", "car", "gon", "fer", "rod", "mor", "per", "sa", "lo"]
+
+
+class Datos:
+    """Ids reales que se usan como variables de las operaciones."""
+
+    def __init__(self, colegios: list, alumnos: list, materias: list):
+        self.colegios = colegios
+        self.alumnos = alumnos
+        self.materias = materias
+
+
+def variables(operacion: str, datos: Datos, azar: random.Random) -> dict:
+    anho = date.today().year
+    if operacion == "buscar_alumnos":
+        return {"nombre": azar.choice(FRAGMENTOS), "apellido": azar.choice([None, azar.choice(FRAGMENTOS)])}
+    if operacion == "alumnos_colegio":
+        return {"colegio": azar.choice(datos.colegios), "offset": azar.randint(0, 10) * 50}
+    if operacion == "estadisticas":
+        return {"anho": azar.choice([anho - 1, anho])}
+    if operacion == "crear_alumno":
+        return {
+            "nombre": "Bench", "apellido": f"Carga {azar.randint(1, 10**6)}",
+            "nacimiento": date(anho - azar.randint(6, 17), 1, 1).isoformat(), "colegio": azar.choice(datos.colegios),
+        }
+    if operacion == "actualizar_alumno":
+        return {"id": azar.choice(datos.alumnos), "apellido": f"Actualizado {azar.randint(1, 10**6)}"}
+    if operacion == "matricular_curso":
+        return {
+            "alumnos": azar.sample(datos.alumnos, min(30, len(datos.alumnos))),
+            "materias": azar.sample(datos.materias, min(3, len(datos.materias))),
+            "anho": anho,
+        }
+    return {}
+
+
+async def cargar_datos(client: httpx.AsyncClient, url: str) -> Datos:
+    respuesta = await client.post(url, json={
+        "query": "{ colegios { id } alumnos(first: 200) { id } materias { id } }"
+    })
+    data = respuesta.json()["data"]
+    return Datos(
+        colegios=[c["id"] for c in data["colegios"]],
+        alumnos=[a["id"] for a in data["alumnos"]],
+        materias=[m["id"] for m in data["materias"]],
+    )
+
+
+def percentil(valores: list, p: float) -> float:
+    return valores[min(int(len(valores) * p), len(valores) - 1)]
+
+
+async def medir(url: str, num_requests: int, concurrencia: int, mezcla: dict, seed: int) -> dict:
+    """Envia `num_requests` operaciones elegidas segun `mezcla`, con a lo sumo `concurrencia` en vuelo."""
+    azar = random.Random(seed)
+    nombres = [nombre for nombre, peso in mezcla.items() if peso > 0]
+    pesos = [mezcla[nombre] for nombre in nombres]
+    elegidas = azar.choices(nombres, weights=pesos, k=num_requests)
+
+    semaforo = asyncio.Semaphore(concurrencia)
+    latencias = {nombre: [] for nombre in nombres}
+    sentencias = {nombre: [] for nombre in nombres}
+    errores = dict.fromkeys(nombres, 0)
+
+    limites = httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia)
+    async with httpx.AsyncClient(timeout=60.0, limits=limites) as client:
+        datos = await cargar_datos(client, url)
+
+        async def una(operacion: str):
+            cuerpo = {"query": OPERACIONES[operacion], "variables": variables(operacion, datos, azar)}
+            async with semaforo:
+                inicio = time.perf_counter()
+                respuesta = await client.post(url, json=cuerpo)
+                latencias[operacion].append(time.perf_counter() - inicio)
+            resultado = respuesta.json() if respuesta.status_code == 200 else {}
+            if respuesta.status_code != 200 or "errors" in resultado:
+                errores[operacion] += 1
+            cantidad = (resultado.get("extensions") or {}).get("sqlStatements")
+            if cantidad is not None:
+                sentencias[operacion].append(cantidad)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*[una(operacion) for operacion in elegidas])
+        duracion = time.perf_counter() - inicio
+
+    resumen = {}
+    for nombre in nombres:
+        tiempos = sorted(latencias[nombre])
+        if not tiempos:
+            continue
+        resumen[nombre] = {
+            "n": len(tiempos),
+            "p50 ms": statistics.median(tiempos) * 1000,
+            "p95 ms": percentil(tiempos, 0.95) * 1000,
+            "p99 ms": percentil(tiempos, 0.99) * 1000,
+            "sql/op": statistics.mean(sentencias[nombre]) if sentencias[nombre] else float("nan"),
+            "errores": errores[nombre],
+        }
+    return {"req/s": num_requests / duracion, "operaciones": resumen}
+
+
+def leer_mezcla(texto: str) -> dict:
+    mezcla = dict.fromkeys(OPERACIONES, 0)
+    for parte in texto.split(","):
+        nombre, _, peso = parte.partition("=")
+        nombre = nombre.strip()
+        if nombre not in OPERACIONES:
+            raise SystemExit(f"operacion desconocida: {nombre} (validas: {', '.join(OPERACIONES)})")
+        mezcla[nombre] = float(peso or 1)
+    return mezcla
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark de una mezcla de operaciones GraphQL de colegio")
+    parser.add_argument("--url", default=URL)
+    parser.add_argument("--solicitudes", type=int, default=2000)
+    parser.add_argument("--concurrencia", type=int, default=50)
+    parser.add_argument("--mezcla", type=leer_mezcla, default=MEZCLA_DEFECTO)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"--- {args.solicitudes} solicitudes, concurrencia {args.concurrencia} ---")
+    resultado = await medir(args.url, args.solicitudes, args.concurrencia, args.mezcla, args.seed)
+    print(f"req/s: {resultado['req/s']:.1f}")
+    for nombre, valores in resultado["operaciones"].items():
+        print(f"{nombre:18}", ", ".join(f"{clave}: {valor:.1f}" for clave, valor in valores.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
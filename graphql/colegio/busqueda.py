@@ -0,0 +1,90 @@
+from sqlalchemy import Float, Integer, text
+from sqlalchemy.orm import Session
+
+from models import Alumno as AlumnoModel
+
+# Indice de texto para buscar alumnos por partes del nombre o apellido.
+# FTS5 con tokenizer trigram indexa cada secuencia de 3 caracteres, asi
+# `nombre: "dua"` encuentra "Eduardo" sin recorrer toda la tabla.
+# Es una tabla de contenido externo (no duplica los textos) que los
+# triggers mantienen al dia en cada insert, update y delete de alumnos.
+
+LARGO_MINIMO = 3  # un trigram necesita al menos 3 caracteres
+
+DDL_INDICE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS alumnos_fts USING fts5(
+        nombre, apellido, content='alumnos', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS alumnos_fts_insert AFTER INSERT ON alumnos BEGIN
+        INSERT INTO alumnos_fts(rowid, nombre, apellido) VALUES (new.id, new.nombre, new.apellido);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS alumnos_fts_delete AFTER DELETE ON alumnos BEGIN
+        INSERT INTO alumnos_fts(alumnos_fts, rowid, nombre, apellido)
+        VALUES ('delete', old.id, old.nombre, old.apellido);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS alumnos_fts_update AFTER UPDATE OF nombre, apellido ON alumnos BEGIN
+        INSERT INTO alumnos_fts(alumnos_fts, rowid, nombre, apellido)
+        VALUES ('delete', old.id, old.nombre, old.apellido);
+        INSERT INTO alumnos_fts(rowid, nombre, apellido) VALUES (new.id, new.nombre, new.apellido);
+    END
+    """,
+]
+
+
+def crear_indice(engine):
+    """Crea el indice y sus triggers; si el indice es nuevo lo llena con los alumnos existentes."""
+    with engine.begin() as conexion:
+        existia = conexion.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'alumnos_fts'")
+        ).first() is not None
+        for ddl in DDL_INDICE:
+            conexion.execute(text(ddl))
+        if not existia:
+            conexion.execute(text("INSERT INTO alumnos_fts(alumnos_fts) VALUES ('rebuild')"))
+
+
+def _frase(columna: str, valor: str) -> str:
+    # entre comillas el valor es una frase literal: no se interpretan operadores de FTS5
+    return f'{columna}: "{valor.replace(chr(34), chr(34) * 2)}"'
+
+
+def buscar_alumnos(db: Session, nombre: str = None, apellido: str = None,
+                   colegio_id: int = None, limite: int = 50, desde: int = 0) -> list:
+    """Alumnos cuyo nombre/apellido contiene los textos dados, los mas relevantes primero.
+
+    Los textos de 3 o mas caracteres se resuelven con el indice y se ordenan por
+    bm25. Los mas cortos no tienen trigramas y se filtran con LIKE.
+    """
+    query = db.query(AlumnoModel)
+    frases = []
+    for columna, valor in (("nombre", nombre), ("apellido", apellido)):
+        if not valor:
+            continue
+        if len(valor) >= LARGO_MINIMO:
+            frases.append(_frase(columna, valor))
+        else:
+            query = query.filter(getattr(AlumnoModel, columna).ilike(f"%{valor}%"))
+
+    if frases:
+        coincidencias = (
+            text("SELECT rowid, bm25(alumnos_fts) AS rango FROM alumnos_fts WHERE alumnos_fts MATCH :expresion")
+            .bindparams(expresion=" AND ".join(frases))
+            .columns(rowid=Integer, rango=Float)
+            .subquery("coincidencias")
+        )
+        query = query.join(coincidencias, coincidencias.c.rowid == AlumnoModel.id)
+        query = query.order_by(coincidencias.c.rango, AlumnoModel.id)
+    else:
+        query = query.order_by(AlumnoModel.id)
+
+    if colegio_id:
+        query = query.filter(AlumnoModel.colegio_id == colegio_id)
+
+    return query.offset(desde).limit(limite).all()
@@ -0,0 +1,33 @@
+import os
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from strawberry.extensions import SchemaExtension
+
+from db import engine
+
+# Con COLEGIO_CONTAR_SQL=1 cada respuesta GraphQL incluye en `extensions.sqlStatements`
+# la cantidad de sentencias SQL que ejecuto la operacion (lo usa benchmark.py)
+CONTAR_SQL = os.getenv("COLEGIO_CONTAR_SQL", "0") == "1"
+
+# contador de la operacion en curso; los DataLoaders corren en tareas que heredan el contexto
+_contador = ContextVar("contador_sql", default=None)
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _contar(conn, cursor, statement, parameters, context, executemany):
+    contador = _contador.get()
+    if contador is not None:
+        contador["sentencias"] += 1
+
+
+class ContarSQL(SchemaExtension):
+
+    def on_operation(self):
+        self.contador = {"sentencias": 0}
+        token = _contador.set(self.contador)
+        yield
+        _contador.reset(token)
+
+    def get_results(self):
+        return {"sqlStatements": self.contador["sentencias"]}
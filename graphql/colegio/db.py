@@ -1,5 +1,6 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.orm import configure_mappers, sessionmaker, declarative_base, Session
+from sqlalchemy.schema import CreateIndex
 
 DATABASE_URL = "sqlite:///./colegio.db"
 
@@ -7,9 +8,37 @@ engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Version del esquema de la base (tablas, indices, FTS y triggers); subirla al cambiarlo
+ESQUEMA_VERSION = 1
+
 def init_db():
+    """Crea tablas, indices, la tabla FTS de busqueda y los triggers de estadisticas.
+
+    No hace nada si PRAGMA user_version ya llego a ESQUEMA_VERSION (el mismo
+    criterio que init_db en banco/graphql/models.py).
+    """
     from models import Colegio, Alumno, Materia, Matriculacion
+    from busqueda import crear_indice
+    from estadisticas import crear_contadores
+    with engine.connect() as conexion:
+        if conexion.exec_driver_sql("PRAGMA user_version").scalar() >= ESQUEMA_VERSION:
+            return
     Base.metadata.create_all(bind=engine)
+    # p.ej. ux_matriculaciones_alumno_materia_anho en una base anterior a ese indice
+    with engine.begin() as conexion:
+        for tabla in Base.metadata.sorted_tables:
+            for indice in tabla.indexes:
+                conexion.execute(CreateIndex(indice, if_not_exists=True))
+    crear_indice(engine)
+    crear_contadores(engine)
+    with engine.begin() as conexion:
+        conexion.exec_driver_sql(f"PRAGMA user_version = {ESQUEMA_VERSION}")
+
+def precalentar():
+    """Configura los mappers de models.py y abre la primera conexion de `engine`."""
+    configure_mappers()
+    with engine.connect():
+        pass
 
 def get_db() -> Session:
     db = SessionLocal()
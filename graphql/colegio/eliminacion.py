@@ -0,0 +1,75 @@
+from typing import List
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from models import (
+    Colegio as ColegioModel,
+    Alumno as AlumnoModel,
+    Materia as MateriaModel,
+    Matriculacion as MatriculacionModel,
+    PlanEstudios as PlanEstudiosModel,
+    Curso as CursoModel,
+)
+
+# Filas por transaccion. Cada lote se confirma por separado, asi el lock de
+# escritura de SQLite se suelta entre lotes y otras escrituras no esperan a
+# que termine un borrado grande. Se borra siempre primero lo dependiente:
+# si el proceso se corta a mitad no quedan matriculaciones huerfanas y
+# repetir la operacion continua donde quedo.
+LOTE_ELIMINACION = 500
+
+
+def _borrar_en_lotes(db: Session, modelo, condicion, resumen: dict, lote: int):
+    ids = select(modelo.id).where(condicion).limit(lote)
+    while True:
+        stmt = delete(modelo).where(modelo.id.in_(ids)).execution_options(synchronize_session=False)
+        try:
+            borradas = db.execute(stmt).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if borradas:
+            resumen[modelo.__tablename__] += borradas
+            resumen["lotes"] += 1
+        if borradas < lote:
+            return
+
+
+def _resumen() -> dict:
+    return {"matriculaciones": 0, "alumnos": 0, "planes_estudios": 0, "materias": 0, "colegios": 0, "lotes": 0}
+
+
+def eliminar_alumnos(db: Session, alumno_ids: List[int], lote: int = LOTE_ELIMINACION) -> dict:
+    resumen = _resumen()
+    ids = sorted(set(alumno_ids))
+    for inicio in range(0, len(ids), lote):
+        bloque = ids[inicio:inicio + lote]
+        _borrar_en_lotes(db, MatriculacionModel, MatriculacionModel.alumno_id.in_(bloque), resumen, lote)
+        _borrar_en_lotes(db, AlumnoModel, AlumnoModel.id.in_(bloque), resumen, lote)
+    return resumen
+
+
+def eliminar_colegio(db: Session, colegio_id: int, lote: int = LOTE_ELIMINACION) -> dict:
+    """Borra el colegio con sus alumnos, las matriculaciones de esos alumnos y su plan de estudios."""
+    resumen = _resumen()
+    alumnos = select(AlumnoModel.id).where(AlumnoModel.colegio_id == colegio_id)
+    _borrar_en_lotes(db, MatriculacionModel, MatriculacionModel.alumno_id.in_(alumnos), resumen, lote)
+    _borrar_en_lotes(db, AlumnoModel, AlumnoModel.colegio_id == colegio_id, resumen, lote)
+    _borrar_en_lotes(db, PlanEstudiosModel, PlanEstudiosModel.colegio_id == colegio_id, resumen, lote)
+    _borrar_en_lotes(db, ColegioModel, ColegioModel.id == colegio_id, resumen, lote)
+    return resumen
+
+
+def eliminar_curso(db: Session, curso: int, lote: int = LOTE_ELIMINACION) -> dict:
+    """Borra las materias del curso con sus matriculaciones, planes de estudio y secciones."""
+    resumen = _resumen()
+    materias = select(MateriaModel.id).where(MateriaModel.curso == curso)
+    _borrar_en_lotes(db, MatriculacionModel, MatriculacionModel.materia_id.in_(materias), resumen, lote)
+    _borrar_en_lotes(db, PlanEstudiosModel, PlanEstudiosModel.materia_id.in_(materias), resumen, lote)
+    _borrar_en_lotes(db, PlanEstudiosModel, PlanEstudiosModel.curso == curso, resumen, lote)
+    _borrar_en_lotes(db, MateriaModel, MateriaModel.curso == curso, resumen, lote)
+    db.execute(delete(CursoModel).where(CursoModel.curso == curso))
+    db.commit()
+    return resumen
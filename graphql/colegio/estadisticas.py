@@ -0,0 +1,147 @@
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from models import EstadisticaMatriculacion as EstadisticaModel
+
+# Cantidad de matriculaciones por (colegio, materia, curso, año lectivo).
+# Los contadores de `estadisticas_matriculacion` los mantienen triggers de
+# SQLite, asi cualquier escritura (ORM, INSERT masivo o DELETE por lotes)
+# los deja al dia sin recalcular nada al consultar. Un alumno sin colegio o
+# una materia sin curso cuentan con 0 en esa columna.
+
+_SUMAR = """
+    INSERT INTO estadisticas_matriculacion (colegio_id, materia_id, curso, anho_lectivo, cantidad)
+    {select}
+    ON CONFLICT (colegio_id, materia_id, curso, anho_lectivo)
+    DO UPDATE SET cantidad = cantidad + excluded.cantidad;
+"""
+
+
+def _sumar_matriculacion(fila: str, signo: str) -> str:
+    return _SUMAR.format(select=f"""
+        SELECT IFNULL(a.colegio_id, 0), m.id, IFNULL(m.curso, 0), {fila}.anho_lectivo, {signo}1
+        FROM alumnos a, materias m
+        WHERE a.id = {fila}.alumno_id AND m.id = {fila}.materia_id
+    """)
+
+
+def _mover(colegio: str, curso: str, filtro: str, signo: str) -> str:
+    # todas las matriculaciones del alumno o materia modificados, agrupadas por contador
+    return _SUMAR.format(select=f"""
+        SELECT {colegio}, m.id, {curso}, mt.anho_lectivo, {signo}count(*)
+        FROM matriculaciones mt
+        JOIN alumnos a ON a.id = mt.alumno_id
+        JOIN materias m ON m.id = mt.materia_id
+        WHERE {filtro}
+        GROUP BY m.id, mt.anho_lectivo, IFNULL(a.colegio_id, 0)
+    """)
+
+
+DDL_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS estadisticas_matriculacion_insert AFTER INSERT ON matriculaciones BEGIN
+        {_sumar_matriculacion("new", "+")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS estadisticas_matriculacion_delete AFTER DELETE ON matriculaciones BEGIN
+        {_sumar_matriculacion("old", "-")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS estadisticas_matriculacion_update
+    AFTER UPDATE OF alumno_id, materia_id, anho_lectivo ON matriculaciones BEGIN
+        {_sumar_matriculacion("old", "-")}
+        {_sumar_matriculacion("new", "+")}
+    END
+    """,
+    # cambiar de colegio a un alumno o de curso a una materia mueve sus matriculaciones
+    f"""
+    CREATE TRIGGER IF NOT EXISTS estadisticas_alumno_colegio AFTER UPDATE OF colegio_id ON alumnos
+    WHEN IFNULL(old.colegio_id, 0) != IFNULL(new.colegio_id, 0) BEGIN
+        {_mover("IFNULL(old.colegio_id, 0)", "IFNULL(m.curso, 0)", "mt.alumno_id = new.id", "-")}
+        {_mover("IFNULL(new.colegio_id, 0)", "IFNULL(m.curso, 0)", "mt.alumno_id = new.id", "+")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS estadisticas_materia_curso AFTER UPDATE OF curso ON materias
+    WHEN IFNULL(old.curso, 0) != IFNULL(new.curso, 0) BEGIN
+        {_mover("IFNULL(a.colegio_id, 0)", "IFNULL(old.curso, 0)", "mt.materia_id = new.id", "-")}
+        {_mover("IFNULL(a.colegio_id, 0)", "IFNULL(new.curso, 0)", "mt.materia_id = new.id", "+")}
+    END
+    """,
+]
+
+SQL_CALCULAR = """
+    INSERT INTO estadisticas_matriculacion (colegio_id, materia_id, curso, anho_lectivo, cantidad)
+    SELECT IFNULL(a.colegio_id, 0), m.id, IFNULL(m.curso, 0), mt.anho_lectivo, count(*)
+    FROM matriculaciones mt
+    JOIN alumnos a ON a.id = mt.alumno_id
+    JOIN materias m ON m.id = mt.materia_id
+    GROUP BY IFNULL(a.colegio_id, 0), m.id, IFNULL(m.curso, 0), mt.anho_lectivo
+"""
+
+CLAVE = "colegio_id, materia_id, curso, anho_lectivo"
+
+
+def crear_contadores(engine):
+    """Crea los triggers; si los contadores estaban vacios los calcula desde matriculaciones."""
+    with engine.begin() as conexion:
+        for ddl in DDL_TRIGGERS:
+            conexion.execute(text(ddl))
+    with engine.connect() as conexion:
+        vacios = conexion.execute(text("SELECT 1 FROM estadisticas_matriculacion LIMIT 1")).first() is None
+    if vacios:
+        reconstruir(engine)
+
+
+def reconstruir(engine) -> dict:
+    """Recalcula todos los contadores desde cero en una transaccion.
+
+    Devuelve cuantos contadores quedaron y cuantos diferian de los anteriores,
+    para detectar si los incrementales se desviaron.
+    """
+    with engine.begin() as conexion:
+        # el DELETE toma el lock de escritura: nadie matricula mientras se recalcula
+        anteriores = {
+            tuple(fila[:4]): fila[4]
+            for fila in conexion.execute(text(f"DELETE FROM estadisticas_matriculacion RETURNING {CLAVE}, cantidad"))
+            if fila[4] != 0
+        }
+        conexion.execute(text(SQL_CALCULAR))
+        nuevas = {
+            tuple(fila[:4]): fila[4]
+            for fila in conexion.execute(text(f"SELECT {CLAVE}, cantidad FROM estadisticas_matriculacion"))
+        }
+    diferencias = sum(1 for clave in anteriores.keys() | nuevas.keys() if anteriores.get(clave) != nuevas.get(clave))
+    return {"contadores": len(nuevas), "diferencias": diferencias}
+
+
+DIMENSIONES = ("colegio_id", "materia_id", "curso", "anho_lectivo")
+
+
+def consultar(db: Session, filtros: dict, agrupar_por=DIMENSIONES) -> list:
+    """Suma los contadores que cumplen `filtros`, agrupados por las dimensiones pedidas.
+
+    Las dimensiones no agrupadas vuelven como None.
+    """
+    columnas = [getattr(EstadisticaModel, nombre) for nombre in agrupar_por]
+    stmt = select(*columnas, func.sum(EstadisticaModel.cantidad)).where(EstadisticaModel.cantidad != 0)
+    for nombre, valor in filtros.items():
+        if valor is not None:
+            stmt = stmt.where(getattr(EstadisticaModel, nombre) == valor)
+    stmt = stmt.group_by(*columnas).order_by(*columnas)
+    resultados = []
+    for fila in db.execute(stmt):
+        valores = dict.fromkeys(DIMENSIONES)
+        valores.update(zip(agrupar_por, fila))
+        valores["cantidad"] = fila[-1]
+        resultados.append(valores)
+    return resultados
+
+
+if __name__ == "__main__":
+    # python estadisticas.py  -> recalcula los contadores e informa las diferencias
+    from db import engine, init_db
+    init_db()
+    print(reconstruir(engine))
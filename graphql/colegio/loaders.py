@@ -0,0 +1,36 @@
+from typing import List
+from strawberry.dataloader import DataLoader
+from sqlalchemy.orm import Session
+
+from models import (
+    Colegio as ColegioModel,
+    Alumno as AlumnoModel,
+    Materia as MateriaModel,
+)
+
+
+def _cargar_por_id(db: Session, modelo, ids: List[int]) -> list:
+    # una sola consulta IN (...) para todas las keys del nivel
+    filas = db.query(modelo).filter(modelo.id.in_(ids)).all()
+    por_id = {fila.id: fila for fila in filas}
+    # un resultado por id y en el orden de `ids`; None si la fila no existe
+    return [por_id.get(id) for id in ids]
+
+
+def crear_loaders(db: Session) -> dict:
+    """Loaders por id de colegios, alumnos y materias sobre la sesion `db` del request."""
+
+    async def cargar_colegios(ids: List[int]) -> list:
+        return _cargar_por_id(db, ColegioModel, ids)
+
+    async def cargar_alumnos(ids: List[int]) -> list:
+        return _cargar_por_id(db, AlumnoModel, ids)
+
+    async def cargar_materias(ids: List[int]) -> list:
+        return _cargar_por_id(db, MateriaModel, ids)
+
+    return {
+        "colegio": DataLoader(load_fn=cargar_colegios),
+        "alumno": DataLoader(load_fn=cargar_alumnos),
+        "materia": DataLoader(load_fn=cargar_materias),
+    }
@@ -1,14 +1,31 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
+from graphql import graphql
 from strawberry.fastapi import GraphQLRouter
 from schema import schema
-from db import init_db
+from db import get_db, init_db, precalentar
+from loaders import crear_loaders
 
-app = FastAPI()
 
-# Inicializa la base de datos y crea las tablas si no existen
-init_db()
+@asynccontextmanager
+async def lifespan(app):
+    # colegio.db: tablas, busqueda FTS y triggers de estadisticas (ver db.init_db)
+    init_db()
+    precalentar()
+    # calienta graphql-core sin pasar por ContarSQL (COLEGIO_CONTAR_SQL=1)
+    await graphql(schema._schema, "{ __typename }")
+    yield
 
-graphql_app = GraphQLRouter(schema)
+
+app = FastAPI(lifespan=lifespan)
+
+
+def get_context(db=Depends(get_db)):
+    # resolvers y DataLoaders consultan con la Session `db`; get_db la cierra al terminar el request
+    return {"db": db, "loaders": crear_loaders(db)}
+
+
+graphql_app = GraphQLRouter(schema, context_getter=get_context)
 app.include_router(graphql_app, prefix="/graphql")
 
 
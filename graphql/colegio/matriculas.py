@@ -0,0 +1,63 @@
+from itertools import islice
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from models import (
+    Alumno as AlumnoModel,
+    Materia as MateriaModel,
+    Matriculacion as MatriculacionModel,
+)
+
+# Filas por INSERT multi-valor; 3 parametros por fila quedan lejos del limite de SQLite
+FILAS_POR_INSERT = 500
+
+
+def _existentes(db: Session, modelo, ids: set) -> set:
+    # una consulta IN (...) para todo el conjunto, no una por id
+    return set(db.scalars(select(modelo.id).where(modelo.id.in_(ids))))
+
+
+def _bloques(filas, tamanio: int):
+    filas = iter(filas)
+    while bloque := list(islice(filas, tamanio)):
+        yield bloque
+
+
+def matricular_lote(db: Session, alumno_ids: List[int], materia_ids: List[int], anho_lectivo: int) -> dict:
+    """Matricula cada alumno en cada materia para el año lectivo, en una transaccion.
+
+    Los ids inexistentes se informan y se omiten. Las matriculaciones que ya
+    existen las descarta el indice unico (ON CONFLICT DO NOTHING), sin
+    consultarlas antes.
+    """
+    alumnos = set(alumno_ids)
+    materias = set(materia_ids)
+    alumnos_validos = _existentes(db, AlumnoModel, alumnos)
+    materias_validas = _existentes(db, MateriaModel, materias)
+
+    filas = (
+        {"alumno_id": alumno_id, "materia_id": materia_id, "anho_lectivo": anho_lectivo}
+        for alumno_id in sorted(alumnos_validos)
+        for materia_id in sorted(materias_validas)
+    )
+    creadas = 0
+    try:
+        for bloque in _bloques(filas, FILAS_POR_INSERT):
+            stmt = insert(MatriculacionModel).values(bloque).on_conflict_do_nothing()
+            creadas += db.execute(stmt).rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    solicitadas = len(alumnos_validos) * len(materias_validas)
+    return {
+        "solicitadas": solicitadas,
+        "creadas": creadas,
+        "duplicadas": solicitadas - creadas,
+        "alumnos_inexistentes": sorted(alumnos - alumnos_validos),
+        "materias_inexistentes": sorted(materias - materias_validas),
+    }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index, Table
 from sqlalchemy.orm import relationship
 from db import Base
 
@@ -19,7 +19,7 @@ class Alumno(Base):
     nombre = Column(String)
     apellido = Column(String)
     fecha_nacimiento = Column(Date)
-    colegio_id = Column(Integer, ForeignKey("colegios.id"))
+    colegio_id = Column(Integer, ForeignKey("colegios.id"), index=True)
 
     colegio = relationship("Colegio", back_populates="alumnos")
     matriculaciones = relationship("Matriculacion", back_populates="alumno")
@@ -30,8 +30,9 @@ class Materia(Base):
     nombre = Column(String)
     curso = Column(Integer)
     profesor_id = Column(Integer, ForeignKey("profesores.id"))
+    profesor = relationship("Profesores", back_populates="materias")
     matriculaciones = relationship("Matriculacion", back_populates="materia")
-    planes_estudios = relationship("PlanEstudios", back_populates="materias")
+    planes_estudios = relationship("PlanEstudios", back_populates="materia")
     
 
 class Profesores(Base):
@@ -43,15 +44,29 @@ class Profesores(Base):
 
 class Matriculacion(Base):
     __tablename__ = "matriculaciones"
+    # un alumno se matricula una sola vez por materia y año lectivo
+    __table_args__ = (
+        Index("ux_matriculaciones_alumno_materia_anho", "alumno_id", "materia_id", "anho_lectivo", unique=True),
+    )
     id = Column(Integer, primary_key=True)
     alumno_id = Column(Integer, ForeignKey("alumnos.id"), nullable=False)
-    materia_id = Column(Integer, ForeignKey("materias.id"), nullable=False)
+    materia_id = Column(Integer, ForeignKey("materias.id"), nullable=False, index=True)
     anho_lectivo = Column(Integer, nullable=False)
 
     alumno = relationship("Alumno", back_populates="matriculaciones")
     materia = relationship("Materia", back_populates="matriculaciones")
 
+class EstadisticaMatriculacion(Base):
+    # contadores mantenidos por triggers (ver estadisticas.py); 0 = sin colegio / sin curso
+    __tablename__ = "estadisticas_matriculacion"
+    colegio_id = Column(Integer, primary_key=True)
+    materia_id = Column(Integer, primary_key=True)
+    curso = Column(Integer, primary_key=True)
+    anho_lectivo = Column(Integer, primary_key=True)
+    cantidad = Column(Integer, nullable=False, default=0)
+
 class Curso(Base):
+    __tablename__ = "cursos"
     id = Column(Integer, primary_key=True)
     curso= Column(Integer, nullable=False)
     seccion = Column(String, nullable=False)
@@ -1,8 +1,15 @@
 import strawberry
 from datetime import date
+from enum import Enum
 from typing import List, Optional
 from strawberry.types import Info
-from db import get_db
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from busqueda import buscar_alumnos
+from matriculas import matricular_lote
+import eliminacion
+import estadisticas
+from contador_sql import CONTAR_SQL, ContarSQL
 
 from models import (
     Colegio as ColegioModel,
@@ -29,21 +36,72 @@ class Alumno:
     nombre: str
     apellido: str
     fecha_nacimiento: date
-    colegio: Colegio
+
+    # las relaciones se resuelven con los DataLoaders del request (una consulta por nivel)
+    # en lugar de la carga lazy del ORM, que hace una consulta por fila
+    @strawberry.field
+    async def colegio(self, info: Info) -> Optional[Colegio]:
+        if self.colegio_id is None:
+            return None
+        return await info.context["loaders"]["colegio"].load(self.colegio_id)
 
 @strawberry.type
 class Matriculacion:
     id: int
-    alumno: Alumno
-    materia: Materia
+    anho_lectivo: int
+
+    @strawberry.field
+    async def alumno(self, info: Info) -> Alumno:
+        return await info.context["loaders"]["alumno"].load(self.alumno_id)
+
+    @strawberry.field
+    async def materia(self, info: Info) -> Materia:
+        return await info.context["loaders"]["materia"].load(self.materia_id)
+
+@strawberry.type
+class ResultadoMatriculacion:
+    solicitadas: int
+    creadas: int
+    duplicadas: int
+    alumnos_inexistentes: List[int]
+    materias_inexistentes: List[int]
+
+@strawberry.enum
+class Dimension(Enum):
+    COLEGIO = "colegio_id"
+    MATERIA = "materia_id"
+    CURSO = "curso"
+    ANHO_LECTIVO = "anho_lectivo"
+
+@strawberry.type
+class EstadisticaMatriculacion:
+    # las dimensiones que no se agrupan quedan en null
+    colegio_id: Optional[int]
+    materia_id: Optional[int]
+    curso: Optional[int]
+    anho_lectivo: Optional[int]
+    cantidad: int
+
+@strawberry.type
+class ResultadoEliminacion:
+    matriculaciones: int
+    alumnos: int
+    planes_estudios: int
+    materias: int
+    colegios: int
+    lotes: int
 
 # ----------- QUERIES ----------------
 
+# Sin `first` se devuelven 50 alumnos y nunca mas de 200 por pagina
+PAGINA_DEFECTO = 50
+PAGINA_MAX = 200
+
 @strawberry.type
 class Query:
     @strawberry.field(name="colegios")
     def colegios(self, info: Info) -> List[Colegio]:
-        db = next(get_db())
+        db = info.context["db"]
         return db.query(ColegioModel).all()
 
     @strawberry.field
@@ -53,30 +111,44 @@ class Query:
         nombre: Optional[str] = None,
         apellido: Optional[str] = None,
         colegio_id: Optional[int] = None,
+        first: Optional[int] = None,
+        offset: int = 0,
     ) -> List[Alumno]:
-        db: Session = next(get_db())
-        query = db.query(AlumnoModel)
-
-        if nombre:
-            query = query.filter(AlumnoModel.nombre.ilike(f"%{nombre}%"))
-        if apellido:
-            query = query.filter(AlumnoModel.apellido.ilike(f"%{apellido}%"))
-        if colegio_id:
-            query = query.filter(AlumnoModel.colegio_id == colegio_id)
-
-        resultados = query.all()
-        return resultados
+        # nombre y apellido buscan subcadenas con el indice trigram, ordenadas por relevancia
+        db: Session = info.context["db"]
+        # como en banco: first se acota a [0, PAGINA_MAX]; SQLite toma LIMIT -1 como sin limite
+        limite = PAGINA_DEFECTO if first is None else max(0, min(first, PAGINA_MAX))
+        return buscar_alumnos(db, nombre, apellido, colegio_id, limite=limite, desde=max(offset, 0))
 
     @strawberry.field
     def materias(self, info: Info) -> List[Materia]:
-        db = next(get_db())
+        db = info.context["db"]
         return db.query(MateriaModel).all()
 
     @strawberry.field
     def matriculaciones(self, info: Info) -> List[Matriculacion]:
-        db = next(get_db())
+        db = info.context["db"]
         return db.query(MatriculacionModel).all()
 
+    @strawberry.field
+    def estadisticas_matriculacion(
+        self,
+        info: Info,
+        colegio_id: Optional[int] = None,
+        materia_id: Optional[int] = None,
+        curso: Optional[int] = None,
+        anho_lectivo: Optional[int] = None,
+        agrupar_por: Optional[List[Dimension]] = None,
+    ) -> List[EstadisticaMatriculacion]:
+        # se leen los contadores precalculados, no se cuentan matriculaciones
+        db = info.context["db"]
+        filtros = {"colegio_id": colegio_id, "materia_id": materia_id, "curso": curso, "anho_lectivo": anho_lectivo}
+        dimensiones = [d.value for d in agrupar_por] if agrupar_por else estadisticas.DIMENSIONES
+        return [
+            EstadisticaMatriculacion(**fila)
+            for fila in estadisticas.consultar(db, filtros, dimensiones)
+        ]
+
 # ----------- MUTATIONS ----------------
 
 @strawberry.type
@@ -84,7 +156,7 @@ class Mutation:
 
     @strawberry.mutation
     def crear_colegio(self, info: Info, nombre: str, direccion: str) -> Colegio:
-        db = next(get_db())
+        db = info.context["db"]
         colegio = ColegioModel(nombre=nombre, direccion=direccion)
         db.add(colegio)
         db.commit()
@@ -93,7 +165,7 @@ class Mutation:
 
     @strawberry.mutation
     def crear_alumno(self, info: Info, nombre: str, apellido: str, fecha_nacimiento: date, colegio_id: int) -> Alumno:
-        db = next(get_db())
+        db = info.context["db"]
         alumno = AlumnoModel(nombre=nombre, apellido=apellido, fecha_nacimiento=fecha_nacimiento, colegio_id=colegio_id)
         db.add(alumno)
         db.commit()
@@ -110,7 +182,7 @@ class Mutation:
         fecha_nacimiento: Optional[date] = None,
         colegio_id: Optional[int] = None
     ) -> Optional[Alumno]:
-        db = next(get_db())
+        db = info.context["db"]
         alumno = db.query(AlumnoModel).get(alumno_id)
         if not alumno:
             raise Exception("Alumno no encontrado")
@@ -130,17 +202,28 @@ class Mutation:
     
     @strawberry.mutation
     def eliminar_alumno(self, info: Info, alumno_id: int) -> bool:
-        db = next(get_db())
-        alumno = db.query(AlumnoModel).get(alumno_id)
-        if not alumno:
+        db = info.context["db"]
+        # borra tambien sus matriculaciones
+        if not eliminacion.eliminar_alumnos(db, [alumno_id])["alumnos"]:
             raise Exception("Alumno no encontrado")
-        db.delete(alumno)
-        db.commit()
         return True
 
+    # borrados masivos: lo dependiente primero, en lotes de LOTE_ELIMINACION filas por transaccion
+    @strawberry.mutation
+    def eliminar_alumnos(self, info: Info, alumno_ids: List[int]) -> ResultadoEliminacion:
+        return ResultadoEliminacion(**eliminacion.eliminar_alumnos(info.context["db"], alumno_ids))
+
+    @strawberry.mutation
+    def eliminar_colegio(self, info: Info, colegio_id: int) -> ResultadoEliminacion:
+        return ResultadoEliminacion(**eliminacion.eliminar_colegio(info.context["db"], colegio_id))
+
+    @strawberry.mutation
+    def eliminar_curso(self, info: Info, curso: int) -> ResultadoEliminacion:
+        return ResultadoEliminacion(**eliminacion.eliminar_curso(info.context["db"], curso))
+
     @strawberry.mutation
     def crear_materia(self, info: Info, nombre: str, curso: int) -> Materia:
-        db = next(get_db())
+        db = info.context["db"]
         materia = MateriaModel(nombre=nombre, curso=curso)
         db.add(materia)
         db.commit()
@@ -148,12 +231,24 @@ class Mutation:
         return materia
 
     @strawberry.mutation
-    def matricular_alumno(self, info: Info, alumno_id: int, materia_id: int) -> Matriculacion:
-        db = next(get_db())
-        matriculacion = MatriculacionModel(alumno_id=alumno_id, materia_id=materia_id)
+    def matricular_alumno(self, info: Info, alumno_id: int, materia_id: int, anho_lectivo: int) -> Matriculacion:
+        db = info.context["db"]
+        matriculacion = MatriculacionModel(alumno_id=alumno_id, materia_id=materia_id, anho_lectivo=anho_lectivo)
         db.add(matriculacion)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise Exception("El alumno ya esta matriculado en la materia ese año lectivo")
         db.refresh(matriculacion)
         return matriculacion
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+    @strawberry.mutation
+    def matricular_curso(
+        self, info: Info, alumno_ids: List[int], materia_ids: List[int], anho_lectivo: int,
+    ) -> ResultadoMatriculacion:
+        # todas las combinaciones alumno x materia en una transaccion
+        db = info.context["db"]
+        return ResultadoMatriculacion(**matricular_lote(db, alumno_ids, materia_ids, anho_lectivo))
+
+schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=[ContarSQL] if CONTAR_SQL else [])
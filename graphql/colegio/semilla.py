@@ -0,0 +1,130 @@
+import argparse
+import random
+import time
+from datetime import date
+
+from sqlalchemy import insert, select
+
+from db import SessionLocal, init_db
+from matriculas import matricular_lote
+from models import (
+    Colegio as ColegioModel,
+    Alumno as AlumnoModel,
+    Materia as MateriaModel,
+    Profesores as ProfesoresModel,
+    PlanEstudios as PlanEstudiosModel,
+)
+
+### Genera datos sinteticos en colegio.db para pruebas de carga
+# python semilla.py --colegios 20 --alumnos 20000 --seed 42
+# La misma semilla genera siempre los mismos datos.
+
+NOMBRES = [
+    "Eduardo", "Maria", "Jose", "Ana", "Luis", "Carmen", "Juan", "Lucia", "Carlos", "Sofia",
+    "Miguel", "Valentina", "Diego", "Camila", "Javier", "Martina", "Andres", "Paula", "Fernando",
+    "Daniela", "Ricardo", "Gabriela", "Santiago", "Florencia", "Matias", "Agustina", "Rodrigo",
+    "Julieta", "Sebastian", "Micaela", "Alejandro", "Rocio", "Gonzalo", "Belen", "Tomas", "Victoria",
+]
+APELLIDOS = [
+    "Morales", "Gonzalez", "Rodriguez", "Gomez", "Fernandez", "Lopez", "Martinez", "Perez", "Garcia",
+    "Sanchez", "Romero", "Sosa", "Torres", "Alvarez", "Ruiz", "Ramirez", "Flores", "Benitez", "Acosta",
+    "Medina", "Herrera", "Suarez", "Aguirre", "Gimenez", "Gutierrez", "Pereira", "Rojas", "Molina",
+    "Castro", "Ortiz", "Silva", "Nuñez", "Cabrera", "Rios", "Ayala", "Villalba",
+]
+MATERIAS = [
+    "Matematica", "Lengua", "Historia", "Geografia", "Biologia", "Fisica", "Quimica", "Ingles",
+    "Educacion Fisica", "Musica", "Arte", "Informatica", "Filosofia", "Economia", "Guarani",
+]
+
+CURSOS = 12
+FILAS_POR_INSERT = 1000
+
+
+def _insertar(db, modelo, filas: list):
+    for inicio in range(0, len(filas), FILAS_POR_INSERT):
+        db.execute(insert(modelo), filas[inicio:inicio + FILAS_POR_INSERT])
+
+
+def curso_de(fecha_nacimiento: date, anho_lectivo: int) -> int:
+    # primer curso a los 6 años
+    return min(max(anho_lectivo - fecha_nacimiento.year - 5, 1), CURSOS)
+
+
+def generar(colegios: int, alumnos: int, materias_por_curso: int, profesores: int,
+            anhos: int, seed: int) -> dict:
+    azar = random.Random(seed)
+    anho_actual = date.today().year
+    db = SessionLocal()
+    try:
+        _insertar(db, ProfesoresModel, [
+            {"nombre": f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}"} for _ in range(profesores)
+        ])
+        profesor_ids = list(db.scalars(select(ProfesoresModel.id)))
+
+        _insertar(db, ColegioModel, [
+            {"nombre": f"Colegio {azar.choice(APELLIDOS)} {i + 1}", "direccion": f"Calle {azar.randint(1, 9999)}"}
+            for i in range(colegios)
+        ])
+        colegio_ids = list(db.scalars(select(ColegioModel.id)))
+
+        _insertar(db, MateriaModel, [
+            {"nombre": f"{nombre} {curso}", "curso": curso, "profesor_id": azar.choice(profesor_ids)}
+            for curso in range(1, CURSOS + 1)
+            for nombre in azar.sample(MATERIAS, min(materias_por_curso, len(MATERIAS)))
+        ])
+        materias_por_curso_ids = {}
+        for materia_id, curso in db.execute(select(MateriaModel.id, MateriaModel.curso)):
+            materias_por_curso_ids.setdefault(curso, []).append(materia_id)
+
+        _insertar(db, PlanEstudiosModel, [
+            {"materia_id": materia_id, "colegio_id": colegio_id, "curso": curso}
+            for colegio_id in colegio_ids
+            for curso, ids in materias_por_curso_ids.items()
+            for materia_id in ids
+        ])
+
+        _insertar(db, AlumnoModel, [
+            {
+                "nombre": azar.choice(NOMBRES),
+                "apellido": f"{azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}",
+                "fecha_nacimiento": date(anho_actual - azar.randint(6, 17), azar.randint(1, 12), azar.randint(1, 28)),
+                "colegio_id": azar.choice(colegio_ids),
+            }
+            for _ in range(alumnos)
+        ])
+        db.commit()
+
+        # cada alumno en todas las materias de su curso, por año lectivo
+        matriculaciones = 0
+        filas = db.execute(select(AlumnoModel.id, AlumnoModel.fecha_nacimiento)).all()
+        for anho in range(anho_actual - anhos + 1, anho_actual + 1):
+            por_curso = {}
+            for alumno_id, nacimiento in filas:
+                por_curso.setdefault(curso_de(nacimiento, anho), []).append(alumno_id)
+            for curso, alumno_ids in por_curso.items():
+                resultado = matricular_lote(db, alumno_ids, materias_por_curso_ids.get(curso, []), anho)
+                matriculaciones += resultado["creadas"]
+    finally:
+        db.close()
+
+    return {
+        "colegios": colegios, "profesores": profesores, "alumnos": alumnos,
+        "materias": sum(len(ids) for ids in materias_por_curso_ids.values()),
+        "matriculaciones": matriculaciones,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Carga datos sinteticos en colegio.db")
+    parser.add_argument("--colegios", type=int, default=20)
+    parser.add_argument("--alumnos", type=int, default=20000)
+    parser.add_argument("--materias", type=int, default=8, help="materias por curso")
+    parser.add_argument("--profesores", type=int, default=60)
+    parser.add_argument("--anhos", type=int, default=2, help="años lectivos con matriculaciones")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    init_db()
+    inicio = time.perf_counter()
+    resumen = generar(args.colegios, args.alumnos, args.materias, args.profesores, args.anhos, args.seed)
+    print(resumen, f"{time.perf_counter() - inicio:.1f} s")
@@ -1,20 +1,179 @@
-from typing import Union
+import math
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from threading import Lock
+from typing import List, Union
 
-from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Query
+from pydantic import BaseModel, Field, field_validator
 
 app = FastAPI()
 
+# Maximo de items por pagina en GET /items/
+LIMITE_MAX = 100
+
 
 class Item(BaseModel):
     nombre: str
-    precio: float
+    # NaN no tiene orden y romperia el indice de precios; tampoco es JSON valido
+    precio: float = Field(allow_inf_nan=False)
+    is_offer: Union[bool, None] = None
+    tipo: Union[str, None] = None
+
+
+class ItemParcial(BaseModel):
+    id: int
+    nombre: Union[str, None] = None
+    precio: Union[float, None] = Field(None, allow_inf_nan=False)
     is_offer: Union[bool, None] = None
+    tipo: Union[str, None] = None
+
+    @field_validator("nombre", "precio")
+    @classmethod
+    def no_nulo(cls, valor):
+        # omitir el campo lo deja como estaba; enviarlo en null no se acepta
+        if valor is None:
+            raise ValueError("no puede ser null")
+        return valor
+
+
+class RepositorioItems:
+    """Almacen en memoria de items con id asignado por el repositorio.
+
+    Los items se guardan en un dict por id y se mantienen indices secundarios
+    por `is_offer` y `tipo` (dicts usados como conjuntos ordenados por id), de
+    modo que un listado filtrado recorre solo los ids del indice.
+
+    Ademas se mantiene un indice de precios ordenado (listas de tuplas
+    `(precio, id)`), uno general y uno por valor de `is_offer`, para resolver
+    rangos de precio y top-N con busqueda binaria.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._por_oferta = {}
+        self._por_tipo = {}
+        self._precios = []
+        self._precios_por_oferta = {}
+        self._siguiente_id = 1
+        self._lock = Lock()
+
+    def _indexar(self, item: dict):
+        self._por_oferta.setdefault(item["is_offer"], {})[item["id"]] = None
+        self._por_tipo.setdefault(item["tipo"], {})[item["id"]] = None
+        clave = (item["precio"], item["id"])
+        insort(self._precios, clave)
+        insort(self._precios_por_oferta.setdefault(item["is_offer"], []), clave)
+
+    def _desindexar(self, item: dict):
+        self._por_oferta[item["is_offer"]].pop(item["id"], None)
+        self._por_tipo[item["tipo"]].pop(item["id"], None)
+        clave = (item["precio"], item["id"])
+        for precios in (self._precios, self._precios_por_oferta[item["is_offer"]]):
+            del precios[bisect_left(precios, clave)]
+
+    def crear(self, datos: dict) -> dict:
+        with self._lock:
+            item = self._combinar({"id": self._siguiente_id}, datos)
+            self._siguiente_id += 1
+            self._items[item["id"]] = item
+            self._indexar(item)
+            return item
 
-repositorio = [
-    {"id": 1, "nombre": "item1", "precio": 10.0, "is_offer": False},
-    {"id": 2, "nombre": "item2", "precio": 20.0, "is_offer": True},
-]
+    def obtener(self, item_id: int) -> Union[dict, None]:
+        return self._items.get(item_id)
+
+    @staticmethod
+    def _combinar(actual: dict, datos: dict) -> dict:
+        item = {**actual, **datos, "id": actual["id"]}
+        if not isinstance(item["nombre"], str) or not isinstance(item["precio"], (int, float)):
+            raise ValueError(f"item {item['id']}: nombre y precio son obligatorios")
+        if not math.isfinite(item["precio"]):
+            raise ValueError(f"item {item['id']}: precio debe ser un numero finito")
+        return item
+
+    def _reemplazar(self, item: dict):
+        self._desindexar(self._items[item["id"]])
+        self._items[item["id"]] = item
+        self._indexar(item)
+
+    def _actualizar(self, item_id: int, datos: dict) -> Union[dict, None]:
+        actual = self._items.get(item_id)
+        if actual is None:
+            return None
+        item = self._combinar(actual, datos)
+        self._reemplazar(item)
+        return item
+
+    def actualizar(self, item_id: int, datos: dict) -> Union[dict, None]:
+        with self._lock:
+            return self._actualizar(item_id, datos)
+
+    def actualizar_lote(self, cambios: List[dict]) -> List[Union[dict, None]]:
+        """Aplica varias actualizaciones parciales bajo un solo lock.
+
+        Ningun lector ve el lote a medias. Devuelve, en el mismo orden, el item
+        actualizado o None si el id no existe. Todos los items nuevos se arman y
+        validan antes de tocar los indices: si alguno es invalido se lanza
+        ValueError y no se aplica ningun cambio del lote.
+        """
+        with self._lock:
+            nuevos = {}
+            resultados = []
+            for cambio in cambios:
+                # un id repetido en el lote parte del resultado del cambio anterior
+                actual = nuevos.get(cambio["id"]) or self._items.get(cambio["id"])
+                item = None if actual is None else self._combinar(actual, cambio)
+                if item is not None:
+                    nuevos[item["id"]] = item
+                resultados.append(item)
+            for item in nuevos.values():
+                self._reemplazar(item)
+            return resultados
+
+    def listar(self, tipo: Union[str, None] = None, is_offer: Union[bool, None] = None,
+               skip: int = 0, limit: int = 10) -> list:
+        with self._lock:
+            candidatos = []
+            if tipo is not None:
+                candidatos.append(self._por_tipo.get(tipo, {}))
+            if is_offer is not None:
+                candidatos.append(self._por_oferta.get(is_offer, {}))
+            if not candidatos:
+                ids = iter(self._items)
+            else:
+                # se recorre el indice mas chico y se verifica contra los demas
+                candidatos.sort(key=len)
+                menor, resto = candidatos[0], candidatos[1:]
+                ids = (i for i in menor if all(i in otro for otro in resto))
+            return [self._items[i] for i in islice(ids, skip, skip + limit)]
+
+    def listar_por_precio(self, precio_min: Union[float, None] = None,
+                          precio_max: Union[float, None] = None,
+                          tipo: Union[str, None] = None, is_offer: Union[bool, None] = None,
+                          descendente: bool = False, skip: int = 0, limit: int = 10) -> list:
+        """Items con precio en [precio_min, precio_max], ordenados por precio.
+
+        Los limites del rango se ubican con busqueda binaria y solo se recorren
+        las entradas que se devuelven (mas las descartadas por `tipo`).
+        """
+        with self._lock:
+            if is_offer is None:
+                precios = self._precios
+            else:
+                precios = self._precios_por_oferta.get(is_offer, [])
+            desde = 0 if precio_min is None else bisect_left(precios, (precio_min,))
+            hasta = len(precios) if precio_max is None else bisect_right(precios, (precio_max, float("inf")))
+            posiciones = range(hasta - 1, desde - 1, -1) if descendente else range(desde, hasta)
+            items = (self._items[precios[p][1]] for p in posiciones)
+            if tipo is not None:
+                items = (item for item in items if item["tipo"] == tipo)
+            return list(islice(items, skip, skip + limit))
+
+
+repositorio = RepositorioItems()
+repositorio.crear({"nombre": "item1", "precio": 10.0, "is_offer": False, "tipo": None})
+repositorio.crear({"nombre": "item2", "precio": 20.0, "is_offer": True, "tipo": None})
 
 @app.get("/")
 def read_root():
@@ -23,27 +182,53 @@ def read_root():
 @app.post("/items/")
 def create_item(item: Item):
     #logica de negocio y valiciio
-    repositorio.append(item)
-    #return item
-    return {"nombre_item": item.nombre, "precio": item.precio, "en_oferta":item.is_offer}
+    nuevo = repositorio.crear(item.model_dump())
+    return {"id": nuevo["id"], "nombre_item": item.nombre, "precio": item.precio, "en_oferta": item.is_offer}
 
-#http://localhost:8000/items/1?nombre=eduardo""
+#http://localhost:8000/items/1
 @app.get("/items/{item_id}")
-def read_item(item_id: int, tipo: Union[str, None] = None):
-    #logica de negocio y valiciio
-    return repositorio[item_id]#{"item_id": item_id, "q": tipo}
+def read_item(item_id: int):
+    item = repositorio.obtener(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return item
 
-#htttp://localhost:8000/items?tipo="comestible"
+#htttp://localhost:8000/items?tipo=comestible&is_offer=true&skip=0&limit=10
+#htttp://localhost:8000/items?precio_min=10&precio_max=50
+#htttp://localhost:8000/items?is_offer=true&orden=precio&limit=5  (las 5 ofertas mas baratas)
 @app.get("/items/")
-def listar():
-    #return {"item_id": item_id, "q": q}
-    return repositorio
+def listar(tipo: Union[str, None] = None, is_offer: Union[bool, None] = None,
+           precio_min: Union[float, None] = None, precio_max: Union[float, None] = None,
+           orden: Union[str, None] = None, skip: int = Query(0, ge=0),
+           limit: int = Query(10, ge=0, le=LIMITE_MAX)):
+    if orden not in (None, "precio", "-precio"):
+        raise HTTPException(status_code=400, detail="orden debe ser 'precio' o '-precio'")
+    if orden is None and precio_min is None and precio_max is None:
+        return repositorio.listar(tipo=tipo, is_offer=is_offer, skip=skip, limit=limit)
+    return repositorio.listar_por_precio(
+        precio_min=precio_min, precio_max=precio_max, tipo=tipo, is_offer=is_offer,
+        descendente=orden == "-precio", skip=skip, limit=limit,
+    )
 
 @app.put("/items/{item_id}")
 def update_item(item_id: int, item: Item):
-
-    sql = "update items set nombre= "+item.nombre+", precio="+str(item.precio)+" where id ="+str(item_id) 
-    print(sql)
-    
+    if repositorio.actualizar(item_id, item.model_dump()) is None:
+        raise HTTPException(status_code=404, detail="Item not found")
     return {"nombre_item": item.nombre, "item_id": item_id,"en_oferta":item.is_offer}
 
+#PATCH http://localhost:8000/items  [{"id": 1, "precio": 9.5}, {"id": 2, "is_offer": false}]
+@app.patch("/items")
+def update_items(cambios: List[ItemParcial]):
+    # solo los campos enviados; los ausentes quedan como estaban
+    lote = [c.model_dump(exclude_unset=True) for c in cambios]
+    try:
+        actualizados = repositorio.actualizar_lote(lote)
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    resultados = []
+    for cambio, item in zip(lote, actualizados):
+        if item is None:
+            resultados.append({"id": cambio["id"], "ok": False, "detail": "Item not found"})
+        else:
+            resultados.append({"id": cambio["id"], "ok": True, "item": item})
+    return resultados
@@ -0,0 +1,173 @@
+import importlib.abc
+import importlib.machinery
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+### Mide el arranque en frio de una app GraphQL: tiempo de import por modulo,
+### construccion del schema, inicializacion de la base y primeros requests.
+# python perfil_arranque.py banco/graphql/graphql_main.py
+# python perfil_arranque.py graphql/colegio/main.py
+# python perfil_arranque.py graphql_tuto/schema.py [cantidad de modulos a listar]
+
+# La medicion corre en un proceso nuevo (import en frio) con `python -X importtime`,
+# dentro de la carpeta de la app porque las bases usan rutas relativas.
+
+CONSULTA_PRUEBA = "{ __typename }"
+
+
+def _cronometrar(clase, metodo: str, tiempos: dict):
+    """Acumula el tiempo de `clase.metodo` por modulo que lo llama."""
+    original = getattr(clase, metodo)
+
+    def medido(*args, **kwargs):
+        llamador = sys._getframe(1).f_globals.get("__name__", "?")
+        inicio = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            tiempos[llamador] += (time.perf_counter() - inicio) * 1000
+
+    setattr(clase, metodo, medido)
+
+
+class _AlImportar(importlib.abc.MetaPathFinder):
+    """Aplica un parche a un modulo recien cuando la app lo importa.
+
+    Si el perfilador importara strawberry o sqlalchemy para parchearlos, su
+    tiempo de import se contaria aunque la app no los use (graphql_tuto).
+    """
+
+    def __init__(self, parches: dict):
+        self.parches = parches
+
+    def find_spec(self, nombre, ruta, objetivo=None):
+        parche = self.parches.pop(nombre, None)
+        if parche is None:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(nombre, ruta)
+        ejecutar = spec.loader.exec_module
+
+        def exec_module(modulo):
+            ejecutar(modulo)
+            parche(modulo)
+
+        spec.loader.exec_module = exec_module
+        return spec
+
+
+class _Cronometro:
+    """Envuelve la app ASGI y mide cada request del lado del servidor.
+
+    Asi no se cuenta lo que tarda el TestClient en prepararse la primera vez.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.ultimo = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        inicio = time.perf_counter()
+        await self.app(scope, receive, send)
+        self.ultimo = (time.perf_counter() - inicio) * 1000
+
+
+def medir(ruta: str) -> dict:
+    """Se ejecuta en el proceso hijo: importa la app y le hace los primeros requests."""
+    directorio, archivo = os.path.split(os.path.abspath(ruta))
+    sys.path.insert(0, directorio)
+
+    schemas = defaultdict(float)
+    create_all = defaultdict(float)
+    sys.meta_path.insert(0, _AlImportar({
+        "strawberry.schema.schema": lambda m: _cronometrar(m.Schema, "__init__", schemas),
+        "sqlalchemy.sql.schema": lambda m: _cronometrar(m.MetaData, "create_all", create_all),
+    }))
+    inicio = time.perf_counter()
+    # __import__ pasa por el import de C, que es el que registra -X importtime
+    modulo = __import__(os.path.splitext(archivo)[0])
+    fases = {"import": (time.perf_counter() - inicio) * 1000}
+
+    from fastapi.testclient import TestClient
+    servidor = _Cronometro(modulo.app)
+    inicio = time.perf_counter()
+    with TestClient(servidor) as cliente:
+        # el context manager ejecuta el lifespan de la app (startup)
+        fases["startup"] = (time.perf_counter() - inicio) * 1000
+        for fase in ("primer request", "segundo request"):
+            respuesta = cliente.post("/graphql", json={"query": CONSULTA_PRUEBA})
+            respuesta.raise_for_status()
+            fases[fase] = servidor.ultimo
+
+    return {"fases": fases, "schema": schemas, "create_all": create_all}
+
+
+def _leer_importtime(salida: str) -> list:
+    # formato: "import time: self [us] | cumulative | imported package" (la sangria indica el nivel)
+    modulos = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        modulos.append((nombre.strip(), int(propio) / 1000, int(acumulado) / 1000))
+    return modulos
+
+
+def _modulos_de_app(directorio: str) -> set:
+    return {os.path.splitext(f)[0] for f in os.listdir(directorio) if f.endswith(".py")}
+
+
+def perfilar(ruta: str, cantidad: int = 15):
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--medir", os.path.abspath(ruta)],
+        cwd=directorio, capture_output=True, text=True,
+    )
+    if proceso.returncode != 0:
+        print(proceso.stderr[-3000:])
+        raise SystemExit(proceso.returncode)
+    resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+    modulos = _leer_importtime(proceso.stderr)
+    propios = _modulos_de_app(directorio)
+
+    print(f"--- {ruta} ---")
+    for fase, ms in resultado["fases"].items():
+        print(f"{fase:18} {ms:8.1f} ms")
+
+    print("\nconstruccion del schema (strawberry.Schema) por modulo:")
+    for nombre, ms in resultado["schema"].items():
+        print(f"  {nombre:30} {ms:8.1f} ms")
+    print("create_all por modulo:")
+    for nombre, ms in resultado["create_all"].items():
+        print(f"  {nombre:30} {ms:8.1f} ms")
+    if not resultado["create_all"]:
+        print("  (no se ejecuto)")
+
+    # el tiempo propio sumado por paquete raiz reparte el total sin contar dos veces
+    por_paquete = defaultdict(float)
+    for nombre, propio, _ in modulos:
+        raiz = nombre.split(".")[0]
+        por_paquete["(app) " + raiz if raiz in propios else raiz] += propio
+    print(f"\nimport por paquete (tiempo propio, top {cantidad}):")
+    for nombre, ms in sorted(por_paquete.items(), key=lambda x: -x[1])[:cantidad]:
+        print(f"  {nombre:30} {ms:8.1f} ms")
+
+    print("\nmodulos de la app (tiempo propio / acumulado con lo que importan):")
+    for nombre, propio, acumulado in modulos:
+        if nombre in propios:
+            print(f"  {nombre:30} {propio:8.1f} ms {acumulado:8.1f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--medir":
+        print(json.dumps(medir(sys.argv[2])))
+    elif len(sys.argv) > 1:
+        perfilar(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 15)
+    else:
+        raise SystemExit("uso: python perfil_arranque.py <ruta de la app> [cantidad]")